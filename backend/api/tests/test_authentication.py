@@ -0,0 +1,245 @@
+import shutil
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models.query import QuerySet
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.authtoken.models import Token
+
+from recipes.checks import check_version_cache
+from users.authentication import (CachedTokenAuthentication, TokenCache,
+                                  auth_version, token_cache,)
+from users.checks import check_token_cache
+
+User = get_user_model()
+
+
+def make_token(key: str, user_id: int) -> Token:
+    """Токен с пользователем без сохранения в базу данных.
+
+    Args:
+        - key (str): Ключ токена.
+        - user_id (int): ID пользователя.
+
+    Returns:
+        - Token: Токен.
+    """
+    return Token(key=key, user=User(id=user_id, username=key))
+
+
+def store(tokens: TokenCache, key: str, user_id: int) -> None:
+    """Сохранение токена с текущей версией пользователя.
+
+    Args:
+        - tokens (TokenCache): Кеш токенов.
+        - key (str): Ключ токена.
+        - user_id (int): ID пользователя.
+    """
+    tokens.set(make_token(key, user_id), auth_version(user_id))
+
+
+@override_settings(
+    CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'token-cache',
+        }
+    },
+)
+class TokenCacheTest(SimpleTestCase):
+    """Вытеснение, устаревание и сброс записей кеша токенов."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_hit_and_miss(self) -> None:
+        """Сохраненный токен возвращается, неизвестный считается промахом."""
+        tokens = TokenCache(max_size=2, ttl=60)
+        token = make_token('a', 1)
+        tokens.set(token, auth_version(1))
+        self.assertIs(tokens.get('a'), token)
+        self.assertIsNone(tokens.get('b'))
+        stats = tokens.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+    def test_lru_eviction(self) -> None:
+        """При переполнении вытесняется давно не использованный токен."""
+        tokens = TokenCache(max_size=2, ttl=60)
+        store(tokens, 'a', 1)
+        store(tokens, 'b', 2)
+        tokens.get('a')
+        store(tokens, 'c', 3)
+        self.assertIsNotNone(tokens.get('a'))
+        self.assertIsNone(tokens.get('b'))
+        self.assertIsNotNone(tokens.get('c'))
+        self.assertEqual(tokens.stats()['evictions'], 1)
+        self.assertEqual(tokens.stats()['size'], 2)
+
+    def test_ttl(self) -> None:
+        """Запись устаревает через `ttl` секунд."""
+        tokens = TokenCache(max_size=2, ttl=60)
+        with mock.patch('users.authentication.time.monotonic') as monotonic:
+            monotonic.return_value = 1000.0
+            store(tokens, 'a', 1)
+            monotonic.return_value = 1059.0
+            self.assertIsNotNone(tokens.get('a'))
+            monotonic.return_value = 1060.0
+            self.assertIsNone(tokens.get('a'))
+        self.assertEqual(tokens.stats()['size'], 0)
+
+    def test_invalidate_other_process(self) -> None:
+        """Сброс в одном процессе делает записи других процессов
+        недействительными через версию в общем кеше.
+        """
+        first, second = TokenCache(10, 60), TokenCache(10, 60)
+        store(first, 'a', 1)
+        store(second, 'a', 1)
+        store(second, 'b', 2)
+        first.invalidate(1)
+        self.assertIsNone(first.get('a'))
+        self.assertIsNone(second.get('a'))
+        self.assertIsNotNone(second.get('b'))
+        self.assertEqual(first.stats()['invalidations'], 1)
+
+    def test_token_after_invalidate(self) -> None:
+        """Токен, сохраненный после сброса, снова используется."""
+        tokens = TokenCache(10, 60)
+        store(tokens, 'a', 1)
+        tokens.invalidate(1)
+        store(tokens, 'a', 1)
+        self.assertIsNotNone(tokens.get('a'))
+
+    def test_invalidate_before_set(self) -> None:
+        """Токен, прочитанный до сброса, не используется после сохранения."""
+        tokens = TokenCache(10, 60)
+        version = auth_version(1)
+        token = make_token('a', 1)
+        tokens.invalidate(1)
+        tokens.set(token, version)
+        self.assertIsNone(tokens.get('a'))
+
+
+class CachedTokenAuthenticationTest(TestCase):
+    """Чтение токенов из кеша в зависимости от бэкенда кеша."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = User.objects.create(
+            email='token@foodgram.ru',
+            username='token',
+            first_name='token',
+            last_name='token',
+        )
+        cls.token = Token.objects.create(user=cls.user)
+
+    def setUp(self) -> None:
+        self.addCleanup(token_cache.invalidate, self.user.id)
+
+    def test_shared_cache(self) -> None:
+        """С общим кешем повторная аутентификация без запросов."""
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path, ignore_errors=True)
+        with override_settings(
+            CACHES={
+                'default': {
+                    'BACKEND': (
+                        'django.core.cache.backends.filebased.FileBasedCache'
+                    ),
+                    'LOCATION': path,
+                }
+            },
+        ):
+            authentication = CachedTokenAuthentication()
+            with self.assertNumQueries(2):
+                authentication.authenticate_credentials(self.token.key)
+            with self.assertNumQueries(0):
+                user, token = authentication.authenticate_credentials(
+                    self.token.key
+                )
+            self.assertEqual(user, self.user)
+            self.assertEqual(token.key, self.token.key)
+
+    def test_invalidate_during_fetch(self) -> None:
+        """Сброс между чтением токена из базы и сохранением в кеш
+        не оставляет в кеше устаревший токен.
+        """
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path, ignore_errors=True)
+        get = QuerySet.get
+
+        def invalidated_get(*args, **kwargs) -> Token:
+            token = get(*args, **kwargs)
+            token_cache.invalidate(self.user.id)
+            return token
+
+        with override_settings(
+            CACHES={
+                'default': {
+                    'BACKEND': (
+                        'django.core.cache.backends.filebased.FileBasedCache'
+                    ),
+                    'LOCATION': path,
+                }
+            },
+        ):
+            authentication = CachedTokenAuthentication()
+            with mock.patch.object(
+                QuerySet,
+                'get',
+                autospec=True,
+                side_effect=invalidated_get,
+            ):
+                authentication.authenticate_credentials(self.token.key)
+            with self.assertNumQueries(2):
+                authentication.authenticate_credentials(self.token.key)
+
+    def test_process_local_cache(self) -> None:
+        """С кешем процесса токен каждый раз читается из базы."""
+        with override_settings(
+            CACHES={
+                'default': {
+                    'BACKEND': (
+                        'django.core.cache.backends.locmem.LocMemCache'
+                    ),
+                    'LOCATION': 'token-auth',
+                }
+            },
+        ):
+            authentication = CachedTokenAuthentication()
+            for _ in range(2):
+                with self.assertNumQueries(1):
+                    authentication.authenticate_credentials(self.token.key)
+
+
+class CacheChecksTest(SimpleTestCase):
+    """Предупреждения о кеше, не общем для процессов."""
+
+    def test_checks(self) -> None:
+        """Предупреждения только для кеша процесса или без хранения."""
+        for backend, expected in (
+            ('locmem.LocMemCache', ['users.W001', 'recipes.W001']),
+            ('dummy.DummyCache', ['users.W001', 'recipes.W001']),
+            ('filebased.FileBasedCache', []),
+        ):
+            with self.subTest(backend=backend), override_settings(
+                CACHES={
+                    'default': {
+                        'BACKEND': f'django.core.cache.backends.{backend}',
+                        'LOCATION': tempfile.gettempdir(),
+                    }
+                },
+            ):
+                self.assertEqual(
+                    [
+                        warning.id
+                        for warning in (
+                            *check_token_cache(None),
+                            *check_version_cache(None),
+                        )
+                    ],
+                    expected,
+                )
@@ -0,0 +1,111 @@
+import base64
+import shutil
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from recipes import constants as con
+from recipes.models import Ingredient, Recipe, RecipeIngredientAmount, Tag
+from recipes.storage import content_hash_storage
+
+User = get_user_model()
+
+IMAGE: str = (
+    'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAA'
+    'DUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=='
+)
+
+
+class RecipeBulkImagesTest(TestCase):
+    """Изображения пакета рецептов при откате транзакции."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = User.objects.create(
+            email='bulk@foodgram.ru',
+            username='bulk',
+            first_name='bulk',
+            last_name='bulk',
+        )
+        cls.payload = {
+            'recipes': [{
+                'ingredients': [{
+                    'id': Ingredient.objects.create(
+                        name='bulk',
+                        measurement_unit='г',
+                    ).id,
+                    'amount': 10,
+                }],
+                'tags': [
+                    Tag.objects.create(
+                        name='bulk',
+                        color='#bulk',
+                        slug='bulk',
+                    ).id,
+                ],
+                'name': 'bulk',
+                'text': 'bulk',
+                'cooking_time': 10,
+                'image': f'data:image/png;base64,{IMAGE}',
+            }],
+        }
+
+    def setUp(self) -> None:
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        settings = override_settings(MEDIA_ROOT=media)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post_failing(self) -> None:
+        """Запрос пакета с ошибкой базы данных после вставки рецептов."""
+        with mock.patch.object(
+            RecipeIngredientAmount.objects,
+            'bulk_create',
+            side_effect=DatabaseError,
+        ), self.assertRaises(DatabaseError):
+            self.client.post(
+                reverse('recipe-bulk'),
+                self.payload,
+                format='json',
+            )
+        self.assertFalse(Recipe.objects.filter(name='bulk').exists())
+
+    def stored(self) -> list[str]:
+        """Файлы каталога изображений рецептов.
+
+        Returns:
+            - list[str]: Имена файлов.
+        """
+        if not content_hash_storage.exists(con.IMAGE_UPLOAD_DIR):
+            return []
+        return content_hash_storage.listdir(con.IMAGE_UPLOAD_DIR)[1]
+
+    def test_rollback_deletes_image(self) -> None:
+        """Изображение откатанного рецепта удаляется."""
+        self.post_failing()
+        self.assertEqual(self.stored(), [])
+
+    def test_rollback_keeps_shared_image(self) -> None:
+        """Файл, на который ссылается сохраненный рецепт, остается."""
+        name = content_hash_storage.save(
+            f'{con.IMAGE_UPLOAD_DIR}shared.png',
+            ContentFile(base64.b64decode(IMAGE)),
+        )
+        Recipe.objects.create(
+            name='shared',
+            author=self.user,
+            image=name,
+            text='shared',
+            cooking_time=1,
+        )
+        self.post_failing()
+        self.assertTrue(content_hash_storage.exists(name))
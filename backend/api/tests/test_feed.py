@@ -0,0 +1,197 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from recipes import constants as con
+from recipes.feed import read_authors
+from recipes.models import FeedRecipe, Recipe
+from recipes.tools import fill_feeds
+from users.models import Follow
+
+User = get_user_model()
+
+PUB_DATA: datetime = datetime(2024, 2, 1, 12, 0, tzinfo=timezone.utc)
+# Минуты публикации рецептов авторов, совпадающие минуты
+# проверяют порядок по ID.
+MINUTES: dict[str, tuple[int, ...]] = {
+    'fanned': (0, 2, 3, 5, 7),
+    'direct': (1, 2, 4, 5, 6),
+    'stranger': (3, 8),
+}
+
+
+class FeedTest(TestCase):
+    """Объединение рецептов из ленты и авторов,
+    рецепты которых читаются напрямую.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        User.objects.bulk_create(
+            User(
+                email=f'feed-{username}@foodgram.ru',
+                username=f'feed-{username}',
+                first_name=username,
+                last_name=username,
+            )
+            for username in ('reader', *MINUTES)
+        )
+        users = {
+            user.first_name: user
+            for user in User.objects.filter(username__startswith='feed-')
+        }
+        cls.reader = users['reader']
+        Recipe.objects.bulk_create(
+            Recipe(
+                name=f'{name} {minute}',
+                author=users[name],
+                image='recipe/images/feed.png',
+                text=name,
+                cooking_time=1,
+            )
+            for name, minutes in MINUTES.items()
+            for minute in minutes
+        )
+        for recipe in Recipe.objects.filter(author__in=users.values()):
+            recipe.pub_data = PUB_DATA + timedelta(
+                minutes=int(recipe.name.split()[-1])
+            )
+            recipe.save(update_fields=['pub_data'])
+        Follow.objects.bulk_create(
+            Follow(user=cls.reader, following=users[name])
+            for name in ('fanned', 'direct')
+        )
+        fill_feeds(FeedRecipe, Recipe, [cls.reader.id])
+        User.objects.filter(id=users['direct'].id).update(feed_direct=True)
+        cls.direct = users['direct']
+        cls.expected = list(
+            Recipe.objects.filter(
+                author__in=(users['fanned'], users['direct'])
+            ).order_by('-pub_data', '-id').values_list('id', flat=True)
+        )
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.client.force_authenticate(self.reader)
+
+    def walk(self, limit: int) -> list[dict]:
+        """Обход ленты по ссылкам `next`.
+
+        Args:
+            - limit (int): Размер страницы.
+
+        Returns:
+            - list[dict]: Ответы страниц.
+        """
+        pages = []
+        url = f'{reverse("recipe-feed")}?cursor=&limit={limit}'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.data)
+            url = response.data['next']
+        return pages
+
+    def test_read_authors(self) -> None:
+        """Напрямую читаются только авторы с `feed_direct`."""
+        self.assertEqual(read_authors(self.reader.id), [self.direct.id])
+
+    def test_stale_entries_kept(self) -> None:
+        """Записи ленты автора, читаемого напрямую, остаются в таблице
+        и не должны дублировать его рецепты на страницах.
+        """
+        self.assertTrue(
+            FeedRecipe.objects.filter(
+                user=self.reader,
+                author=self.direct,
+            ).exists()
+        )
+
+    def test_merged_pages(self) -> None:
+        """Страницы объединяют оба источника без пропусков и повторов."""
+        for limit in (1, 2, 3, 4, 20):
+            with self.subTest(limit=limit):
+                pages = self.walk(limit)
+                self.assertEqual(
+                    [
+                        recipe['id']
+                        for page in pages
+                        for recipe in page['results']
+                    ],
+                    self.expected,
+                )
+                self.assertTrue(
+                    all(len(page['results']) <= limit for page in pages)
+                )
+
+    def test_previous_link(self) -> None:
+        """Ссылка `previous` возвращает предыдущую страницу."""
+        pages = self.walk(3)
+        for previous, page in zip(pages, pages[1:]):
+            response = self.client.get(page['previous'])
+            self.assertEqual(
+                [recipe['id'] for recipe in response.data['results']],
+                [recipe['id'] for recipe in previous['results']],
+            )
+
+
+@mock.patch.object(con, 'FEED_FANOUT_MIN_FOLLOWERS', 1)
+@mock.patch.object(con, 'FEED_FANOUT_MAX_FOLLOWERS', 2)
+class FeedModeTest(TestCase):
+    """Переключение автора между записью в ленты и чтением напрямую."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        User.objects.bulk_create(
+            User(
+                email=f'mode-{index}@foodgram.ru',
+                username=f'mode-{index}',
+                first_name='mode',
+                last_name='mode',
+            )
+            for index in range(4)
+        )
+        cls.author, *cls.followers = User.objects.filter(
+            username__startswith='mode-'
+        ).order_by('id')
+        Recipe.objects.create(
+            name='mode',
+            author=cls.author,
+            image='recipe/images/mode.png',
+            text='mode',
+            cooking_time=1,
+        )
+
+    def state(self) -> tuple[bool, int]:
+        """Режим автора и количество записей его рецептов в лентах.
+
+        Returns:
+            - tuple[bool, int]: `feed_direct` и количество записей.
+        """
+        self.author.refresh_from_db()
+        return (
+            self.author.feed_direct,
+            FeedRecipe.objects.filter(author=self.author).count(),
+        )
+
+    def test_hysteresis(self) -> None:
+        """Запись в ленты возобновляется только ниже нижнего порога."""
+        follows = [
+            Follow.objects.create(user=follower, following=self.author)
+            for follower in self.followers
+        ]
+        self.assertEqual(self.state(), (True, 2))
+        follows.pop().delete()
+        self.assertEqual(self.state(), (True, 2))
+        Follow.objects.create(user=self.followers[-1], following=self.author)
+        self.assertEqual(self.state(), (True, 2))
+        # Подписчиков снова не больше верхнего порога, ленты
+        # не пересобираются, удаляются только записи бывшего подписчика.
+        follows.pop().delete()
+        self.assertEqual(self.state(), (True, 1))
+        follows.pop().delete()
+        self.assertEqual(self.state(), (False, 1))
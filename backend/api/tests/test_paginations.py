@@ -0,0 +1,223 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.db.models.query import QuerySet
+from django.test import SimpleTestCase, TestCase
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.v1.paginations import RecipeCursorPagination, UserCursorPagination
+from recipes.models import Recipe
+
+User = get_user_model()
+
+PUB_DATA: datetime = datetime(2024, 2, 1, 12, 30, tzinfo=timezone.utc)
+
+
+def walk(
+    pagination_class: type[CursorPagination],
+    queryset: QuerySet,
+    url: str
+) -> list[tuple[list, str or None, str or None]]:
+    """Обход всех страниц по ссылкам `next`.
+
+    Args:
+        - pagination_class (type[CursorPagination]): Класс пагинации.
+        - queryset (QuerySet): Объекты.
+        - url (str): Адрес первой страницы.
+
+    Returns:
+        - list[tuple[list, str or None, str or None]]: Объекты страницы,
+        ссылки `next` и `previous` каждой страницы.
+    """
+    pages = []
+    while url:
+        pagination = pagination_class()
+        page = pagination.paginate_queryset(
+            queryset,
+            Request(APIRequestFactory().get(url)),
+        )
+        url = pagination.get_next_link()
+        pages.append((page, url, pagination.get_previous_link()))
+    return pages
+
+
+class RecipeCursorTest(SimpleTestCase):
+    """Позиция курсора рецептов и условие выборки страницы."""
+
+    def test_position_round_trip(self) -> None:
+        """Позиция рецепта разбирается в дату публикации и ID."""
+        pagination = RecipeCursorPagination()
+        position = pagination.get_position(
+            SimpleNamespace(pub_data=PUB_DATA, id=15)
+        )
+        self.assertEqual(position, '2024-02-01T12:30:00+00:00_15')
+        self.assertEqual(pagination.parse_position(position), (PUB_DATA, 15))
+
+    def test_invalid_position(self) -> None:
+        """Позиция не того формата отклоняется."""
+        pagination = RecipeCursorPagination()
+        for position in ('', '15', 'date_15', f'{PUB_DATA.isoformat()}_x'):
+            with self.subTest(position=position):
+                with self.assertRaises(NotFound):
+                    pagination.parse_position(position)
+
+    def test_keyset(self) -> None:
+        """Условие сравнивает ключ `(pub_data, id)` лексикографически."""
+        pagination = RecipeCursorPagination()
+        position = f'{PUB_DATA.isoformat()}_15'
+        self.assertEqual(
+            pagination.keyset(position, False),
+            (
+                Q(pub_data__lt=PUB_DATA)
+                | Q(pub_data=PUB_DATA, id__lt=15),
+                ('-pub_data', '-id'),
+            ),
+        )
+        self.assertEqual(
+            pagination.keyset(position, True),
+            (
+                Q(pub_data__gt=PUB_DATA)
+                | Q(pub_data=PUB_DATA, id__gt=15),
+                ('pub_data', 'id'),
+            ),
+        )
+        self.assertEqual(
+            pagination.keyset(None, False),
+            (Q(), ('-pub_data', '-id')),
+        )
+
+
+class RecipeCursorPaginationTest(TestCase):
+    """Обход ленты рецептов по курсорам."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        author = User.objects.create(
+            email='cursor@foodgram.ru',
+            username='cursor',
+            first_name='cursor',
+            last_name='cursor',
+        )
+        Recipe.objects.bulk_create(
+            Recipe(
+                name=f'cursor {index}',
+                author=author,
+                image='recipe/images/cursor.png',
+                text='cursor',
+                cooking_time=1,
+            )
+            for index in range(7)
+        )
+        Recipe.objects.filter(
+            id__in=Recipe.objects.order_by('id').values('id')[:4]
+        ).update(pub_data=PUB_DATA)
+
+    def test_pages_cover_all_recipes(self) -> None:
+        """Страницы без пропусков и повторов при одинаковой дате."""
+        expected = list(
+            Recipe.objects.order_by('-pub_data', '-id')
+            .values_list('id', flat=True)
+        )
+        pages = walk(
+            RecipeCursorPagination,
+            Recipe.objects.all(),
+            '/api/recipes/?cursor=&limit=2',
+        )
+        self.assertEqual(
+            [recipe.id for page, _, _ in pages for recipe in page],
+            expected,
+        )
+        self.assertEqual([len(page) for page, _, _ in pages], [2, 2, 2, 1])
+        self.assertIsNone(pages[0][2])
+        self.assertIsNone(pages[-1][1])
+
+    def test_previous_link(self) -> None:
+        """Ссылка `previous` возвращает предыдущую страницу."""
+        pages = walk(
+            RecipeCursorPagination,
+            Recipe.objects.all(),
+            '/api/recipes/?cursor=&limit=2',
+        )
+        for (previous, _, _), (_, _, link) in zip(pages, pages[1:]):
+            pagination = RecipeCursorPagination()
+            page = pagination.paginate_queryset(
+                Recipe.objects.all(),
+                Request(APIRequestFactory().get(link)),
+            )
+            self.assertEqual(page, previous)
+
+
+class UserCursorTest(SimpleTestCase):
+    """Позиция курсора пользователей."""
+
+    def test_username_with_underscores(self) -> None:
+        """ID отделяется по последнему `_`, имя может содержать `_`."""
+        pagination = UserCursorPagination()
+        for username in ('chef', 'chef_1', 'chef_1_2', 'chef_', '_'):
+            with self.subTest(username=username):
+                position = pagination.get_position(
+                    SimpleNamespace(username=username, id=7)
+                )
+                self.assertEqual(
+                    pagination.parse_position(position),
+                    (username, 7),
+                )
+
+    def test_invalid_position(self) -> None:
+        """Позиция без имени или ID отклоняется."""
+        pagination = UserCursorPagination()
+        for position in ('', 'chef', '_7', 'chef_', 'chef_x'):
+            with self.subTest(position=position):
+                with self.assertRaises(NotFound):
+                    pagination.parse_position(position)
+
+    def test_keyset(self) -> None:
+        """Условие сравнивает ключ `(username, id)` лексикографически."""
+        self.assertEqual(
+            UserCursorPagination().keyset('chef_1_7', False),
+            (
+                Q(username__gt='chef_1') | Q(username='chef_1', id__gt=7),
+                ('username', 'id'),
+            ),
+        )
+
+
+class UserCursorPaginationTest(TestCase):
+    """Обход списка пользователей по курсорам."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        User.objects.bulk_create(
+            User(
+                email=f'{username}@foodgram.ru',
+                username=username,
+                first_name=username,
+                last_name=username,
+            )
+            for username in (
+                'chef_1', 'chef', 'chef_1_2', 'chef_', 'chef_10', 'chef1',
+            )
+        )
+
+    def test_pages_cover_all_users(self) -> None:
+        """Страницы без пропусков и повторов при `_` в именах."""
+        expected = list(
+            User.objects.order_by('username', 'id')
+            .values_list('id', flat=True)
+        )
+        for limit in (1, 2, 4):
+            with self.subTest(limit=limit):
+                pages = walk(
+                    UserCursorPagination,
+                    User.objects.all(),
+                    f'/api/users/?cursor=&limit={limit}',
+                )
+                self.assertEqual(
+                    [user.id for page, _, _ in pages for user in page],
+                    expected,
+                )
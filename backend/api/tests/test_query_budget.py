@@ -0,0 +1,618 @@
+import shutil
+import tempfile
+from typing import Any, NamedTuple, Optional
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from api.v1 import urls
+from recipes.models import (FavoriteRecipes, FeedRecipe, Ingredient, Recipe,
+                            RecipeIngredientAmount, ShoppingCartIngredient,
+                            ShoppingList, Tag,)
+from recipes.tools import fill_feeds, fill_shopping_carts
+from users.authentication import token_cache
+from users.models import Follow
+
+User = get_user_model()
+
+PREFIX: str = 'budget'
+PASSWORD: str = 'budget-Pa55word'
+NEW_PASSWORD: str = 'budget-Pa55word-new'
+SIZES: tuple[int, int] = (2, 10)
+RECIPES: int = 2
+IMAGE: str = (
+    'data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAA'
+    'DUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=='
+)
+EXCLUDED_ROUTES: tuple[str] = (
+    'api-root',
+    'foodgramuser-activation',
+    'foodgramuser-resend-activation',
+    'foodgramuser-reset-password',
+    'foodgramuser-reset-password-confirm',
+    'foodgramuser-reset-username',
+    'foodgramuser-reset-username-confirm',
+    'foodgramuser-set-username',
+)
+
+
+class Endpoint(NamedTuple):
+    """Эндпоинт API и его бюджет запросов.
+
+    Attributes:
+        - name (str): Имя маршрута для `reverse`.
+        - method (str): Метод запроса.
+        - budget (int): Максимальное число SQL запросов в `PostgreSQL`.
+        - status_code (int): Ожидаемый статус ответа.
+        - anonymous (bool): Проверять запрос анонима.
+        - authorized (bool): Проверять запрос авторизованного пользователя.
+        - lookup (tuple[str, str] or None): Аргумент маршрута
+        и ключ объекта из тестовых данных.
+        - data (dict or None): Тело или параметры запроса.
+        - payload (str or None): Ключ тела запроса из тестовых данных.
+        - paginated (bool): Число запросов не зависит от размера страницы.
+        - vendor_budgets (dict[str, int] or None): Бюджеты для баз данных,
+        в которых запросы эндпоинта выполняются иначе, чем в `PostgreSQL`.
+    """
+    name: str
+    method: str
+    budget: int
+    status_code: int = status.HTTP_200_OK
+    anonymous: bool = True
+    authorized: bool = True
+    lookup: Optional[tuple[str, str]] = None
+    data: Optional[dict] = None
+    payload: Optional[str] = None
+    paginated: bool = False
+    vendor_budgets: Optional[dict[str, int]] = None
+
+
+# Эндпоинты вызываются по порядку, изменяющие запросы
+# рассчитаны на состояние после предыдущих.
+ENDPOINTS: tuple[Endpoint] = (
+    Endpoint('tag-list', 'get', 2),
+    Endpoint('tag-detail', 'get', 2, lookup=('pk', 'tag')),
+    Endpoint('ingredient-list', 'get', 2, data={'name': PREFIX}),
+    Endpoint(
+        'ingredient-list',
+        'get',
+        2,
+        data={'name': 'bugdet', 'mode': 'ranked'},
+    ),
+    Endpoint('ingredient-detail', 'get', 2, lookup=('pk', 'ingredient')),
+    Endpoint('recipe-list', 'get', 6, paginated=True),
+    Endpoint('recipe-list', 'get', 5, data={'cursor': ''}, paginated=True),
+    Endpoint('recipe-list', 'get', 5, data={'count': 'none'}, paginated=True),
+    # Оценка планировщика, небольшая выборка считается точно.
+    Endpoint(
+        'recipe-list',
+        'get',
+        6,
+        data={'count': 'estimate'},
+        paginated=True,
+        vendor_budgets={'sqlite': 5},
+    ),
+    Endpoint('recipe-detail', 'get', 5, lookup=('pk', 'recipe')),
+    # Лента читается из `FeedRecipe`, рецепты страницы одним запросом.
+    Endpoint(
+        'recipe-feed',
+        'get',
+        6,
+        anonymous=False,
+        data={'cursor': ''},
+        paginated=True,
+    ),
+    # Подписки на пользователей страницы загружаются одним запросом.
+    Endpoint('foodgramuser-list', 'get', 4, paginated=True),
+    Endpoint(
+        'foodgramuser-list',
+        'get',
+        3,
+        data={'cursor': ''},
+        paginated=True,
+    ),
+    Endpoint('foodgramuser-detail', 'get', 3, lookup=('id', 'author')),
+    Endpoint('foodgramuser-me', 'get', 2, anonymous=False),
+    # Токен читается из кеша процесса.
+    Endpoint(
+        'token-cache-stats',
+        'get',
+        0,
+        status.HTTP_401_UNAUTHORIZED,
+        authorized=False,
+    ),
+    Endpoint(
+        'token-cache-stats',
+        'get',
+        0,
+        status.HTTP_403_FORBIDDEN,
+        anonymous=False,
+    ),
+    # Рецепты всех авторов страницы загружаются одним запросом.
+    Endpoint(
+        'foodgramuser-subscriptions',
+        'get',
+        4,
+        anonymous=False,
+        data={'recipes_limit': 3},
+        paginated=True,
+    ),
+    Endpoint(
+        'foodgramuser-subscriptions',
+        'get',
+        3,
+        anonymous=False,
+        data={'recipes_limit': 3, 'cursor': ''},
+        paginated=True,
+    ),
+    Endpoint(
+        'foodgramuser-followers',
+        'get',
+        4,
+        anonymous=False,
+        paginated=True,
+    ),
+    Endpoint(
+        'foodgramuser-followers',
+        'get',
+        3,
+        anonymous=False,
+        data={'cursor': ''},
+        paginated=True,
+    ),
+    Endpoint(
+        'recipe-download-shopping-cart',
+        'get',
+        2,
+        anonymous=False,
+    ),
+    # Рецепт добавляется одной вставкой без точки сохранения.
+    Endpoint(
+        'recipe-favorite',
+        'post',
+        3,
+        status.HTTP_201_CREATED,
+        anonymous=False,
+        lookup=('pk', 'recipe'),
+    ),
+    Endpoint(
+        'recipe-favorite',
+        'post',
+        2,
+        status.HTTP_400_BAD_REQUEST,
+        anonymous=False,
+        lookup=('pk', 'recipe'),
+    ),
+    Endpoint(
+        'recipe-favorite',
+        'delete',
+        2,
+        status.HTTP_204_NO_CONTENT,
+        anonymous=False,
+        lookup=('pk', 'recipe'),
+    ),
+    # Суммы ингредиентов списка покупок изменяются тремя запросами.
+    Endpoint(
+        'recipe-shopping-cart',
+        'post',
+        5,
+        status.HTTP_201_CREATED,
+        anonymous=False,
+        lookup=('pk', 'recipe'),
+    ),
+    Endpoint(
+        'recipe-shopping-cart',
+        'delete',
+        4,
+        status.HTTP_204_NO_CONTENT,
+        anonymous=False,
+        lookup=('pk', 'recipe'),
+    ),
+    # Число запросов не зависит от количества ID рецептов.
+    Endpoint(
+        'recipe-bulk-favorite',
+        'delete',
+        3,
+        anonymous=False,
+        payload='bulk',
+    ),
+    Endpoint(
+        'recipe-bulk-favorite',
+        'post',
+        4,
+        anonymous=False,
+        payload='bulk',
+    ),
+    Endpoint(
+        'recipe-bulk-shopping-cart',
+        'delete',
+        5,
+        anonymous=False,
+        payload='bulk',
+    ),
+    Endpoint(
+        'recipe-bulk-shopping-cart',
+        'post',
+        6,
+        anonymous=False,
+        payload='bulk',
+    ),
+    # Подписка и отписка дополняют и очищают ленту подписчика
+    # и переключают автора между записью в ленты и чтением напрямую.
+    Endpoint(
+        'foodgramuser-subscribe',
+        'post',
+        9,
+        status.HTTP_201_CREATED,
+        anonymous=False,
+        lookup=('id', 'author'),
+    ),
+    Endpoint(
+        'foodgramuser-subscribe',
+        'delete',
+        7,
+        status.HTTP_204_NO_CONTENT,
+        anonymous=False,
+        lookup=('id', 'author'),
+    ),
+    # Новый рецепт записывается в ленты подписчиков автора.
+    Endpoint(
+        'recipe-list',
+        'post',
+        14,
+        status.HTTP_201_CREATED,
+        anonymous=False,
+        payload='recipe_data',
+    ),
+    Endpoint(
+        'recipe-detail',
+        'patch',
+        11,
+        anonymous=False,
+        lookup=('pk', 'own'),
+        payload='recipe_patch',
+    ),
+    # Рецепты пакета создаются одним запросом, если база данных
+    # возвращает ID вставленных строк, иначе по одному с обновлением
+    # счетчика и записью в ленты подписчиков.
+    Endpoint(
+        'recipe-bulk',
+        'post',
+        8,
+        anonymous=False,
+        payload='recipe_bulk',
+        vendor_budgets={'sqlite': 12},
+    ),
+    # Частичное обновление без тегов и ингредиентов.
+    Endpoint(
+        'recipe-detail',
+        'patch',
+        7,
+        anonymous=False,
+        lookup=('pk', 'own'),
+        payload='recipe_text',
+    ),
+    Endpoint(
+        'recipe-detail',
+        'delete',
+        12,
+        status.HTTP_204_NO_CONTENT,
+        anonymous=False,
+        lookup=('pk', 'own'),
+    ),
+    Endpoint(
+        'foodgramuser-list',
+        'post',
+        4,
+        status.HTTP_201_CREATED,
+        authorized=False,
+        data={
+            'email': f'{PREFIX}-new@foodgram.ru',
+            'username': f'{PREFIX}-new',
+            'first_name': PREFIX,
+            'last_name': PREFIX,
+            'password': PASSWORD,
+        },
+    ),
+    Endpoint(
+        'login',
+        'post',
+        3,
+        authorized=False,
+        data={
+            'email': f'{PREFIX}-0@foodgram.ru',
+            'password': PASSWORD,
+        },
+    ),
+    # Вход сохраняет `last_login` и сбрасывает кэш токена.
+    Endpoint(
+        'foodgramuser-set-password',
+        'post',
+        3,
+        status.HTTP_204_NO_CONTENT,
+        anonymous=False,
+        data={
+            'current_password': PASSWORD,
+            'new_password': NEW_PASSWORD,
+        },
+    ),
+    # Смена пароля сбрасывает кэш токена, выход читает токен из базы.
+    Endpoint(
+        'logout',
+        'post',
+        4,
+        status.HTTP_204_NO_CONTENT,
+        anonymous=False,
+    ),
+)
+
+
+def route_names(patterns: list) -> set[str]:
+    """Имена всех маршрутов списка с вложенными.
+
+    Args:
+        - patterns (list): Маршруты `urlpatterns`.
+
+    Returns:
+        - set[str]: Имена маршрутов.
+    """
+    names: set[str] = set()
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            names |= route_names(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            names.add(pattern.name)
+    return names
+
+
+def seed(authors: int, recipes: int) -> dict[str, Any]:
+    """Создание тестовых данных.
+
+    Args:
+        - authors (int): Количество авторов.
+        - recipes (int): Количество рецептов у каждого автора.
+
+    Returns:
+        - dict[str, Any]: Пользователь, его токен и ID объектов
+        для подстановки в маршруты.
+    """
+    User.objects.bulk_create(
+        User(
+            email=f'{PREFIX}-{index}@foodgram.ru',
+            username=f'{PREFIX}-{index}',
+            first_name=PREFIX,
+            last_name=PREFIX,
+            password='!',
+        )
+        for index in range(authors + 2)
+    )
+    users = list(
+        User.objects.filter(username__startswith=f'{PREFIX}-').order_by('id')
+    )
+    user, free_author, authors = users[0], users[1], users[2:]
+    user.set_password(PASSWORD)
+    user.save()
+    Tag.objects.bulk_create(
+        Tag(name=f'{PREFIX}{index}', color=f'#{PREFIX}{index}',
+            slug=f'{PREFIX}{index}')
+        for index in range(3)
+    )
+    tags = list(Tag.objects.filter(slug__startswith=PREFIX))
+    Ingredient.objects.bulk_create(
+        Ingredient(name=f'{PREFIX} {index}', measurement_unit='г')
+        for index in range(10)
+    )
+    ingredients = list(Ingredient.objects.filter(name__startswith=PREFIX))
+    Recipe.objects.bulk_create(
+        Recipe(
+            name=f'{PREFIX} {author.id} {index}',
+            author=author,
+            image='recipe/images/budget.png',
+            text=PREFIX,
+            cooking_time=index + 1,
+        )
+        for author in [user, free_author, *authors]
+        for index in range(recipes)
+    )
+    all_recipes = list(Recipe.objects.filter(name__startswith=PREFIX))
+    Recipe.tags.through.objects.bulk_create(
+        Recipe.tags.through(recipe=recipe, tag=tag)
+        for recipe in all_recipes
+        for tag in tags[:2]
+    )
+    RecipeIngredientAmount.objects.bulk_create(
+        RecipeIngredientAmount(
+            recipe=recipe,
+            ingredient=ingredient,
+            amount=index + 1,
+        )
+        for recipe in all_recipes
+        for index, ingredient in enumerate(ingredients[:5])
+    )
+    others = [
+        recipe for recipe in all_recipes
+        if recipe.author_id not in (user.id, free_author.id)
+    ]
+    FavoriteRecipes.objects.bulk_create(
+        FavoriteRecipes(user=user, recipe=recipe) for recipe in others
+    )
+    ShoppingList.objects.bulk_create(
+        ShoppingList(user=user, recipe=recipe) for recipe in others
+    )
+    fill_shopping_carts(
+        ShoppingCartIngredient,
+        RecipeIngredientAmount,
+        [user.id],
+    )
+    Follow.objects.bulk_create(
+        Follow(user=user, following=author) for author in authors
+    )
+    Follow.objects.bulk_create(
+        Follow(user=author, following=user) for author in authors[::2]
+    )
+    fill_feeds(FeedRecipe, Recipe, [user.id])
+    free_recipe = next(
+        recipe for recipe in all_recipes
+        if recipe.author_id == free_author.id
+    )
+    own_recipe = next(
+        recipe for recipe in all_recipes if recipe.author_id == user.id
+    )
+    recipe_data = {
+        'ingredients': [
+            {'id': ingredient.id, 'amount': 10}
+            for ingredient in ingredients[:5]
+        ],
+        'tags': [tag.id for tag in tags[:2]],
+        'name': PREFIX,
+        'text': PREFIX,
+        'cooking_time': 10,
+    }
+    return {
+        'user': user,
+        'token': Token.objects.create(user=user).key,
+        'recipe_data': {**recipe_data, 'image': IMAGE},
+        'recipe_patch': recipe_data,
+        'recipe_text': {'text': PREFIX},
+        'bulk': {'recipes': [recipe.id for recipe in all_recipes[:10]]},
+        'recipe_bulk': {'recipes': [{**recipe_data, 'image': IMAGE}] * 2},
+        'tag': tags[0].id,
+        'ingredient': ingredients[0].id,
+        'recipe': free_recipe.id,
+        'author': free_author.id,
+        'own': own_recipe.id,
+    }
+
+
+class QueryBudgetTest(TransactionTestCase):
+    """Бюджет SQL запросов для эндпоинтов API.
+    - Каждый маршрут вызывается от имени анонима
+    и авторизованного пользователя, проверяются статус ответа
+    и число SQL запросов.
+    - Списки запрашиваются с двумя размерами страницы,
+    число запросов не должно расти вместе с размером страницы.
+    - Используется общий для процессов кеш, как в работающем приложении.
+    - Тест без общей транзакции: точки сохранения внутри
+    запросов считаются так же, как в работающем приложении.
+    """
+    def setUp(self) -> None:
+        media, caches = tempfile.mkdtemp(), tempfile.mkdtemp()
+        for path in (media, caches):
+            self.addCleanup(shutil.rmtree, path, ignore_errors=True)
+        settings = override_settings(
+            MEDIA_ROOT=media,
+            CACHES={
+                'default': {
+                    'BACKEND': (
+                        'django.core.cache.backends.filebased.FileBasedCache'
+                    ),
+                    'LOCATION': caches,
+                },
+            },
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        for target in (
+            'recipes.signals.schedule_image_variants',
+            'api.v1.tools.schedule_image_variants',
+        ):
+            patcher = mock.patch(target)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.objects = seed(SIZES[-1], RECIPES)
+        self.addCleanup(token_cache.invalidate, self.objects['user'].id)
+
+    def test_routes_have_budget(self) -> None:
+        """Все маршруты API описаны в `ENDPOINTS`."""
+        covered = {endpoint.name for endpoint in ENDPOINTS}
+        missing = route_names(urls.urlpatterns) - covered
+        self.assertEqual(missing - set(EXCLUDED_ROUTES), set())
+
+    def test_endpoints(self) -> None:
+        """Статус ответа и число запросов эндпоинтов в бюджете."""
+        anonymous = APIClient()
+        authorized = APIClient()
+        authorized.credentials(
+            HTTP_AUTHORIZATION=f'Token {self.objects["token"]}'
+        )
+        # Токен уже в кеше, как у повторных запросов пользователя.
+        authorized.get(reverse('foodgramuser-me'))
+        for endpoint in ENDPOINTS:
+            kwargs = {}
+            if endpoint.lookup:
+                kwarg, key = endpoint.lookup
+                kwargs[kwarg] = self.objects[key]
+            url = reverse(endpoint.name, kwargs=kwargs)
+            data = endpoint.data
+            if endpoint.payload:
+                data = self.objects[endpoint.payload]
+            clients = []
+            if endpoint.anonymous:
+                clients.append(('anon', anonymous))
+            if endpoint.authorized:
+                clients.append(('auth', authorized))
+            for role, client in clients:
+                with self.subTest(
+                    method=endpoint.method,
+                    url=url,
+                    role=role,
+                    data=endpoint.data,
+                ):
+                    self.check_endpoint(endpoint, client, url, data)
+
+    def check_endpoint(
+        self,
+        endpoint: Endpoint,
+        client: APIClient,
+        url: str,
+        data: Optional[dict],
+    ) -> None:
+        """Проверка статуса ответа и числа запросов эндпоинта.
+        - Запрос `BEGIN` не учитывается: `PostgreSQL` начинает
+        транзакцию без отдельного запроса.
+
+        Args:
+            - endpoint (Endpoint): Эндпоинт.
+            - client (APIClient): Клиент.
+            - url (str): Адрес.
+            - data (dict or None): Тело или параметры запроса.
+        """
+        budget = (endpoint.vendor_budgets or {}).get(
+            connection.vendor,
+            endpoint.budget
+        )
+        counts = []
+        for size in SIZES if endpoint.paginated else (None,):
+            params = dict(data or {})
+            if size:
+                params['limit'] = size
+            with CaptureQueriesContext(connection) as context:
+                response = getattr(client, endpoint.method)(
+                    url,
+                    params,
+                    format='json',
+                )
+                if getattr(response, 'streaming', False):
+                    b''.join(response.streaming_content)
+            self.assertEqual(response.status_code, endpoint.status_code)
+            queries = [
+                query['sql'] for query in context.captured_queries
+                if query['sql'] != 'BEGIN'
+            ]
+            sql = '\n'.join(
+                f'{index}. {query}'
+                for index, query in enumerate(queries, 1)
+            )
+            self.assertLessEqual(len(queries), budget, sql)
+            counts.append(len(queries))
+        self.assertEqual(len(set(counts)), 1, f'{SIZES} -> {counts}')
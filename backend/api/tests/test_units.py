@@ -0,0 +1,87 @@
+from django.test import SimpleTestCase
+
+from recipes.units import display_amount, merge_units, normalize_unit
+
+
+class MergeUnitsTest(SimpleTestCase):
+    """Объединение совместимых единиц измерения списка покупок."""
+
+    def test_single_unit_unchanged(self) -> None:
+        """Ингредиент в одной единице выводится как есть."""
+        rows = [('мука', 'г', 1500), ('соль', 'по вкусу', 1)]
+        self.assertEqual(list(merge_units(rows)), rows)
+
+    def test_compatible_units_merged(self) -> None:
+        """Совместимые единицы суммируются в крупнейшей единице."""
+        rows = [
+            ('молоко', 'л', 1),
+            ('молоко', 'мл', 250),
+            ('сахар', 'г', 500),
+            ('сахар', 'кг', 1),
+        ]
+        self.assertEqual(
+            list(merge_units(rows)),
+            [('молоко', 'л', 1.25), ('сахар', 'кг', 1.5)],
+        )
+
+    def test_whole_amount_is_integer(self) -> None:
+        """Целое количество в крупной единице выводится целым числом."""
+        self.assertEqual(
+            list(merge_units([('вода', 'мл', 800), ('вода', 'стакан', 1)])),
+            [('вода', 'л', 1)],
+        )
+
+    def test_small_amount_kept_in_base_unit(self) -> None:
+        """Количество меньше крупной единицы остается в базовой."""
+        self.assertEqual(
+            list(merge_units([('масло', 'ст. л.', 2), ('масло', 'мл', 5)])),
+            [('масло', 'мл', 35)],
+        )
+
+    def test_incompatible_units_kept(self) -> None:
+        """Несовместимые единицы одного ингредиента не объединяются."""
+        rows = [
+            ('яйца', 'г', 100),
+            ('яйца', 'десяток', 1),
+            ('яйца', 'шт', 2),
+            ('яйца', 'щепотка', 1),
+        ]
+        self.assertEqual(
+            list(merge_units(rows)),
+            [
+                ('яйца', 'г', 100),
+                ('яйца', 'шт.', 12),
+                ('яйца', 'щепотка', 1),
+            ],
+        )
+
+    def test_duplicate_unknown_units(self) -> None:
+        """Повторы неизвестной единицы суммируются без перевода."""
+        rows = [
+            ('соль', 'по вкусу', 1),
+            ('соль', 'по вкусу', 2),
+            ('соль', 'г', 5),
+        ]
+        self.assertEqual(
+            list(merge_units(rows)),
+            [('соль', 'по вкусу', 3), ('соль', 'г', 5)],
+        )
+
+    def test_single_pass(self) -> None:
+        """Строки читаются из итератора за один проход."""
+        rows = iter([('мука', 'г', 1), ('мука', 'кг', 1), ('соль', 'г', 2)])
+        self.assertEqual(
+            list(merge_units(rows)),
+            [('мука', 'кг', 1.001), ('соль', 'г', 2)],
+        )
+
+    def test_normalize_unit(self) -> None:
+        """Единицы сравниваются без учета регистра и пробелов."""
+        self.assertEqual(normalize_unit(' Ст.  Л. '), ('мл', 15))
+        self.assertIsNone(normalize_unit('щепотка'))
+
+    def test_display_amount(self) -> None:
+        """Количество выводится в крупнейшей подходящей единице."""
+        self.assertEqual(display_amount('г', 999), ('г', 999))
+        self.assertEqual(display_amount('г', 2000), ('кг', 2))
+        self.assertEqual(display_amount('мл', 1234), ('л', 1.234))
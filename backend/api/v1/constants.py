@@ -8,7 +8,36 @@ VALIDATE_ERROR_DUPLICATE_TAGS: str = 'Тег повторяется'
 VALIDATE_ERROR_ADD_RECIPE: str = 'Рецепт уже добавлен'
 VALIDATE_ERROR_NOT_FOUND_RECIPE: str = 'Рецепта не существует'
 VALIDATE_ERROR_DELETE_RECIPE: str = 'Рецепт не удален'
+VALIDATE_BULK_MAX_RECIPES: int = 100
+VALIDATE_ERROR_IMAGE_SIZE: str = 'Размер изображения больше {} МБ'
+VALIDATE_ERROR_IMAGE_SIDE: str = 'Сторона изображения больше {} пикселей'
+VALIDATE_ERROR_NOT_IMAGE: str = 'Файл не является изображением'
+VALIDATE_ERROR_JSON_FIELD: str = 'Поле `{}` должно содержать JSON'
+
+
+"""Константы загрузки изображений."""
+UPLOAD_MAX_IMAGE_SIZE: int = 10 * 1024 * 1024
+UPLOAD_MAX_IMAGE_SIDE: int = 5000
+UPLOAD_MAX_HEADER_SIZE: int = 256 * 1024
+UPLOAD_JSON_FIELDS: tuple[str] = ('ingredients', 'tags')
+
+
+"""Константы пагинации."""
+PAGINATION_COUNT_EXACT: str = 'exact'
+PAGINATION_COUNT_NONE: str = 'none'
+PAGINATION_COUNT_ESTIMATE: str = 'estimate'
+PAGINATION_ESTIMATE_THRESHOLD: int = 1000
+PAGINATION_ERROR_NOT_INTEGER: str = 'Номер страницы не является числом'
+PAGINATION_ERROR_LESS_THAN_ONE: str = 'Номер страницы меньше 1'
+PAGINATION_ERROR_EMPTY_PAGE: str = 'На странице нет результатов'
+PAGINATION_ERROR_LAST_PAGE: str = 'Последняя страница неизвестна без подсчета'
 
 
 """Константы вью."""
 VIEW_DOWNLOAD_HEAD: str = 'Список покупок Foodgram'
+VIEW_SEARCH_RANKED: str = 'ranked'
+VIEW_DOWNLOAD_FILENAME: str = 'shopping_list'
+
+
+"""Константы выгрузки."""
+EXPORT_FIELDS: tuple[str] = ('name', 'amount', 'measurement_unit')
@@ -0,0 +1,79 @@
+import csv
+import json
+from collections.abc import Iterable, Iterator
+
+from . import constants as con
+
+
+class Echo:
+    """Буфер для `csv.writer` возвращающий записанную строку."""
+    def write(self, value: str) -> str:
+        return value
+
+
+def export_txt(rows: Iterable[tuple]) -> Iterator[str]:
+    """Список покупок в формате `txt`.
+
+    Args:
+        - rows (Iterable[tuple]): Название, единица измерения и количество.
+
+    Returns:
+        - Iterator[str]: Строки файла.
+    """
+    yield f'{con.VIEW_DOWNLOAD_HEAD}\n'
+    for name, measurement_unit, amount in rows:
+        yield f'{name} {amount} {measurement_unit}\n'
+
+
+def export_csv(rows: Iterable[tuple]) -> Iterator[str]:
+    """Список покупок в формате `csv`.
+
+    Args:
+        - rows (Iterable[tuple]): Название, единица измерения и количество.
+
+    Returns:
+        - Iterator[str]: Строки файла.
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(con.EXPORT_FIELDS)
+    for name, measurement_unit, amount in rows:
+        yield writer.writerow((name, amount, measurement_unit))
+
+
+def export_json(rows: Iterable[tuple]) -> Iterator[str]:
+    """Список покупок в формате `json`.
+
+    Args:
+        - rows (Iterable[tuple]): Название, единица измерения и количество.
+
+    Returns:
+        - Iterator[str]: Части файла.
+    """
+    separator = '['
+    for name, measurement_unit, amount in rows:
+        yield separator + json.dumps(
+            dict(zip(con.EXPORT_FIELDS, (name, amount, measurement_unit))),
+            ensure_ascii=False,
+        )
+        separator = ','
+    yield '[]' if separator == '[' else ']'
+
+
+EXPORTS: dict[str, callable] = {
+    'txt': export_txt,
+    'csv': export_csv,
+    'json': export_json,
+}
+
+
+def encode(chunks: Iterable[str]) -> Iterator[bytes]:
+    """Кодирование частей файла в `utf-8`.
+
+    Args:
+        - chunks (Iterable[str]): Части файла.
+
+    Returns:
+        - Iterator[bytes]: Части файла.
+    """
+    for chunk in chunks:
+        yield chunk.encode()
@@ -1,6 +1,422 @@
-from rest_framework.pagination import PageNumberPagination
+from django.contrib.auth import get_user_model
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models import Q
+from django.db.models.query import QuerySet
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (Cursor, CursorPagination,
+                                       PageNumberPagination,)
+from rest_framework.request import Request
+
+from recipes.feed import read_authors
+from recipes.models import FeedRecipe, Recipe
+from . import constants as con
+
+User = get_user_model()
+
+
+def estimate_count(queryset: QuerySet) -> int or None:
+    """Оценка количества объектов по статистике планировщика.
+
+    Args:
+        - queryset (QuerySet): Объекты.
+
+    Returns:
+        - int or None: Оценка планировщика `PostgreSQL`
+        или ничего для других баз данных.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Пагинатор с оценкой количества объектов.
+    - Большие выборки считаются по статистике планировщика,
+    небольшие точно.
+    """
+    @cached_property
+    def count(self) -> int:
+        estimate = estimate_count(self.object_list)
+        if estimate is None or estimate < con.PAGINATION_ESTIMATE_THRESHOLD:
+            return super().count
+        return estimate
+
+
+class UncountedPaginator(Paginator):
+    """Пагинатор без подсчета количества объектов.
+    - Наличие следующей страницы определяется лишним объектом выборки.
+    """
+    count = None
+
+    def validate_number(self, number: int or str) -> int:
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(con.PAGINATION_ERROR_NOT_INTEGER)
+        if number < 1:
+            raise EmptyPage(con.PAGINATION_ERROR_LESS_THAN_ONE)
+        return number
+
+    def page(self, number: int or str) -> Page:
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        object_list = list(
+            self.object_list[bottom:bottom + self.per_page + 1]
+        )
+        if not object_list and number > 1:
+            raise EmptyPage(con.PAGINATION_ERROR_EMPTY_PAGE)
+        self.num_pages = number + (len(object_list) > self.per_page)
+        return self._get_page(object_list[:self.per_page], number, self)
+
+
+COUNT_PAGINATORS: dict[str, type[Paginator]] = {
+    con.PAGINATION_COUNT_EXACT: Paginator,
+    con.PAGINATION_COUNT_NONE: UncountedPaginator,
+    con.PAGINATION_COUNT_ESTIMATE: EstimatedCountPaginator,
+}
 
 
 class RecipeAndSubscriptionPagination(PageNumberPagination):
-    """Пагинация для рецептов и подписок."""
+    """Пагинация для рецептов и подписок.
+    - Параметр `count` задает подсчет количества объектов:
+        - `exact` точное количество (по умолчанию).
+        - `none` без подсчета, в ответе `count` равен `null`.
+        - `estimate` оценка планировщика для больших выборок.
+    """
+    page_size_query_param = 'limit'
+    count_query_param = 'count'
+
+    def paginate_queryset(
+        self,
+        queryset: QuerySet,
+        request: Request,
+        view: any = None
+    ) -> list or None:
+        """Получение страницы с выбранным подсчетом количества.
+
+        Args:
+            - queryset (QuerySet): Объекты.
+            - request (Request): Запрос.
+            - view (any): Метод или класс обработки запроса.
+
+        Returns:
+            - list or None: Объекты страницы.
+        """
+        self.django_paginator_class = COUNT_PAGINATORS.get(
+            request.query_params.get(self.count_query_param),
+            Paginator,
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_page_number(
+        self,
+        request: Request,
+        paginator: Paginator
+    ) -> int or str:
+        page_number = request.query_params.get(self.page_query_param, 1)
+        if (
+            page_number in self.last_page_strings
+            and isinstance(paginator, UncountedPaginator)
+        ):
+            raise NotFound(
+                self.invalid_page_message.format(
+                    page_number=page_number,
+                    message=con.PAGINATION_ERROR_LAST_PAGE,
+                )
+            )
+        return super().get_page_number(request, paginator)
+
+
+class KeysetCursorPagination(CursorPagination):
+    """Курсорная пагинация по ключу из полей `ordering`.
+    - Страница выбирается условием на ключ последнего объекта
+    без `COUNT` и `OFFSET`, ключ должен быть уникальным.
+    - Курсоры `next` и `previous` непрозрачны для клиента.
+    - Позиция курсора задается в `get_position` и `parse_position`,
+    выборка страницы переопределяется в `get_rows`.
+    """
     page_size_query_param = 'limit'
+
+    def paginate_queryset(
+        self,
+        queryset: QuerySet,
+        request: Request,
+        view: any = None
+    ) -> list or None:
+        """Получение страницы после позиции курсора.
+
+        Args:
+            - queryset (QuerySet): Объекты.
+            - request (Request): Запрос.
+            - view (any): Метод или класс обработки запроса.
+
+        Raises:
+            - NotFound: Курсор указан не корректно.
+
+        Returns:
+            - list or None: Объекты страницы.
+        """
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = None if self.cursor is None else self.cursor.position
+        results = self.get_rows(queryset, request, position, reverse)
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        return self.page
+
+    def keyset(
+        self,
+        position: str or None,
+        reverse: bool,
+        fields: tuple[str, ...] or None = None
+    ) -> tuple[Q, tuple[str, ...]]:
+        """Условие и порядок выборки после позиции курсора.
+
+        Args:
+            - position (str or None): Позиция курсора.
+            - reverse (bool): Выборка к предыдущей странице.
+            - fields (tuple[str, ...] or None): Поля ключа
+            или поля `ordering`.
+
+        Raises:
+            - NotFound: Курсор указан не корректно.
+
+        Returns:
+            - tuple[Q, tuple[str, ...]]: Условие и порядок выборки.
+        """
+        descending = self.ordering[0].startswith('-') != reverse
+        if fields is None:
+            fields = tuple(field.lstrip('-') for field in self.ordering)
+        lookup = 'lt' if descending else 'gt'
+        ordering = tuple(
+            f'-{field}' if descending else field for field in fields
+        )
+        keyset = Q()
+        if position is None:
+            return keyset, ordering
+        equal: dict = {}
+        for field, value in zip(fields, self.parse_position(position)):
+            keyset |= Q(**equal, **{f'{field}__{lookup}': value})
+            equal[field] = value
+        return keyset, ordering
+
+    def get_rows(
+        self,
+        queryset: QuerySet,
+        request: Request,
+        position: str or None,
+        reverse: bool
+    ) -> list:
+        """Объекты после позиции курсора с одним лишним объектом.
+
+        Args:
+            - queryset (QuerySet): Объекты.
+            - request (Request): Запрос.
+            - position (str or None): Позиция курсора.
+            - reverse (bool): Выборка к предыдущей странице.
+
+        Returns:
+            - list: Объекты в порядке выборки.
+        """
+        keyset, ordering = self.keyset(position, reverse)
+        return list(
+            queryset.filter(keyset).order_by(*ordering)[:self.page_size + 1]
+        )
+
+    def parse_position(self, position: str) -> tuple:
+        """Разбор позиции курсора.
+
+        Args:
+            - position (str): Позиция из `get_position`.
+
+        Raises:
+            - NotFound: Курсор указан не корректно.
+
+        Returns:
+            - tuple: Значения полей ключа.
+        """
+        if not position.isdigit():
+            raise NotFound(self.invalid_cursor_message)
+        return (int(position),)
+
+    def get_position(self, instance: any) -> str:
+        """Позиция объекта для курсора.
+
+        Args:
+            - instance (Model): Объект.
+
+        Returns:
+            - str: Позиция формата `id`.
+        """
+        return str(instance.id)
+
+    def get_next_link(self) -> str or None:
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(
+            Cursor(
+                offset=0,
+                reverse=False,
+                position=self.get_position(self.page[-1]),
+            )
+        )
+
+    def get_previous_link(self) -> str or None:
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(
+            Cursor(
+                offset=0,
+                reverse=True,
+                position=self.get_position(self.page[0]),
+            )
+        )
+
+
+class RecipeCursorPagination(KeysetCursorPagination):
+    """Курсорная пагинация для ленты рецептов.
+    - Страница выбирается по ключу `(pub_data, id)`.
+    """
+    ordering = ('-pub_data', '-id')
+
+    def parse_position(self, position: str) -> tuple:
+        """Разбор позиции курсора.
+
+        Args:
+            - position (str): Позиция формата `pub_data_id`.
+
+        Raises:
+            - NotFound: Курсор указан не корректно.
+
+        Returns:
+            - tuple: Дата публикации и ID рецепта.
+        """
+        pub_data, _, id = position.rpartition('_')
+        pub_data = parse_datetime(pub_data)
+        if pub_data is None or not id.isdigit():
+            raise NotFound(self.invalid_cursor_message)
+        return pub_data, int(id)
+
+    def get_position(self, recipe: Recipe) -> str:
+        """Позиция рецепта для курсора.
+
+        Args:
+            - recipe (Recipe): Рецепт.
+
+        Returns:
+            - str: Позиция формата `pub_data_id`.
+        """
+        return f'{recipe.pub_data.isoformat()}_{recipe.id}'
+
+
+class UserCursorPagination(KeysetCursorPagination):
+    """Курсорная пагинация для списка пользователей.
+    - Страница выбирается по ключу `(username, id)`
+    по индексу `user_username_id_idx`.
+    """
+    ordering = ('username', 'id')
+
+    def parse_position(self, position: str) -> tuple:
+        """Разбор позиции курсора.
+
+        Args:
+            - position (str): Позиция формата `username_id`.
+
+        Raises:
+            - NotFound: Курсор указан не корректно.
+
+        Returns:
+            - tuple: Имя и ID пользователя.
+        """
+        username, _, id = position.rpartition('_')
+        if not username or not id.isdigit():
+            raise NotFound(self.invalid_cursor_message)
+        return username, int(id)
+
+    def get_position(self, user: User) -> str:
+        """Позиция пользователя для курсора.
+
+        Args:
+            - user (User): Пользователь.
+
+        Returns:
+            - str: Позиция формата `username_id`.
+        """
+        return f'{user.username}_{user.id}'
+
+
+class FollowCursorPagination(KeysetCursorPagination):
+    """Курсорная пагинация для подписок и подписчиков.
+    - Страница выбирается по ключу `id` подписки
+    по индексам `(user, id)` и `(following, id)`.
+    """
+    ordering = ('id',)
+
+
+class FeedCursorPagination(RecipeCursorPagination):
+    """Курсорная пагинация ленты подписок.
+    - Рецепты большинства авторов читаются из ленты пользователя
+    `FeedRecipe` по индексу `(user, pub_data, recipe)`.
+    - Рецепты авторов с `feed_direct` читаются из рецептов напрямую.
+    - Обе выборки ограничены страницей, объединяются по ключу
+    `(pub_data, id)`, затем рецепты страницы загружаются одним запросом.
+    """
+    def get_rows(
+        self,
+        queryset: QuerySet,
+        request: Request,
+        position: str or None,
+        reverse: bool
+    ) -> list[Recipe]:
+        limit = self.page_size + 1
+        authors = read_authors(request.user.id)
+        keyset, ordering = self.keyset(
+            position,
+            reverse,
+            ('pub_data', 'recipe'),
+        )
+        entries = FeedRecipe.objects.filter(
+            keyset,
+            user=request.user,
+        )
+        if authors:
+            entries = entries.exclude(author__in=authors)
+        keys = list(
+            entries.order_by(*ordering).values_list(
+                'pub_data',
+                'recipe',
+            )[:limit]
+        )
+        if authors:
+            keyset, ordering = self.keyset(position, reverse)
+            keys.extend(
+                Recipe.objects.filter(
+                    keyset,
+                    author__in=authors,
+                ).order_by(*ordering).values_list(
+                    'pub_data',
+                    'id',
+                )[:limit]
+            )
+        keys = sorted(set(keys), reverse=not reverse)[:limit]
+        recipes = queryset.filter(
+            id__in=[id for _, id in keys],
+        ).order_by().in_bulk()
+        return [recipes[id] for _, id in keys if id in recipes]
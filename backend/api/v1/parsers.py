@@ -0,0 +1,120 @@
+import json
+
+from django.conf import settings
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.http import multipartparser
+from django.utils.datastructures import MultiValueDict
+from rest_framework import serializers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import DataAndFiles, MultiPartParser
+
+from . import constants as con
+from .validators import validate_image_header, validate_image_size
+
+
+class FormData(dict):
+    """Данные `multipart` запроса в виде словаря.
+    - Файлы из `MultiValueDict` добавляются одним значением,
+    как при объединении данных и файлов в `Request`.
+    """
+    def copy(self) -> 'FormData':
+        return FormData(self)
+
+    def update(self, other: dict) -> None:
+        if isinstance(other, MultiValueDict):
+            other = other.dict()
+        super().update(other)
+
+
+class ImageUploadHandler(TemporaryFileUploadHandler):
+    """Потоковая загрузка изображения во временный файл.
+    - Запрос больше допустимого размера отклоняется до чтения тела.
+    - Файл записывается частями, размер проверяется по каждой части.
+    - Размеры сторон проверяются по заголовку из первых частей файла.
+    """
+    def handle_raw_input(
+        self,
+        input_data: any,
+        META: dict,
+        content_length: int,
+        boundary: bytes,
+        encoding: str or None = None
+    ) -> None:
+        validate_image_size(
+            content_length - (settings.DATA_UPLOAD_MAX_MEMORY_SIZE or 0)
+        )
+
+    def new_file(self, *args, **kwargs) -> None:
+        super().new_file(*args, **kwargs)
+        self.header: bytes or None = b''
+
+    def receive_data_chunk(self, raw_data: bytes, start: int) -> None:
+        try:
+            validate_image_size(start + len(raw_data))
+            if self.header is not None:
+                self.header += raw_data
+                if validate_image_header(
+                    self.header[:con.UPLOAD_MAX_HEADER_SIZE]
+                ):
+                    self.header = None
+        except serializers.ValidationError:
+            self.file.close()
+            raise
+        return super().receive_data_chunk(raw_data, start)
+
+
+class RecipeMultiPartParser(MultiPartParser):
+    """Парсер `multipart` запроса рецепта.
+    - Изображение загружается через `ImageUploadHandler`
+    без чтения файла в память.
+    - Поля `ingredients` и `tags` передаются строкой `JSON`.
+    - Данные возвращаются словарем, как из `JSON` запроса.
+    """
+    def parse(
+        self,
+        stream: any,
+        media_type: str or None = None,
+        parser_context: dict or None = None
+    ) -> DataAndFiles:
+        """Разбор `multipart` запроса.
+
+        Args:
+            - stream (any): Тело запроса.
+            - media_type (str or None): Тип содержимого.
+            - parser_context (dict or None): Контекст парсера.
+
+        Raises:
+            - ParseError: Запрос не разобран.
+            - serializers.ValidationError: Изображение не прошло проверку
+            или поле не содержит `JSON`.
+
+        Returns:
+            - DataAndFiles: Данные и файлы.
+        """
+        parser_context = parser_context or {}
+        request = parser_context['request']
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        meta = request.META.copy()
+        meta['CONTENT_TYPE'] = media_type
+        try:
+            data, files = multipartparser.MultiPartParser(
+                meta,
+                stream,
+                [ImageUploadHandler(request._request)],
+                encoding,
+            ).parse()
+        except multipartparser.MultiPartParserError as exc:
+            raise ParseError(f'Multipart form parse error - {exc}')
+        except serializers.ValidationError as error:
+            raise serializers.ValidationError({'image': error.detail})
+        data = FormData(data.dict())
+        for field in con.UPLOAD_JSON_FIELDS:
+            if field not in data:
+                continue
+            try:
+                data[field] = json.loads(data[field])
+            except ValueError:
+                raise serializers.ValidationError(
+                    {field: [con.VALIDATE_ERROR_JSON_FIELD.format(field)]}
+                )
+        return DataAndFiles(data, files)
@@ -0,0 +1,40 @@
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+
+class ShoppingCartRenderer(BaseRenderer):
+    """Базовый рендер файла списка покупок.
+    - Файл формируется во вью потоком,
+    рендер выбирает формат по параметру `format` и заголовку `Accept`.
+    - Ошибки отдаются в `json`.
+    """
+    charset = 'utf-8'
+
+    def render(
+        self,
+        data: any,
+        accepted_media_type: str or None = None,
+        renderer_context: dict or None = None
+    ) -> bytes:
+        if data is None:
+            return b''
+        return json.dumps(data, ensure_ascii=False).encode()
+
+
+class TxtRenderer(ShoppingCartRenderer):
+    """Рендер `txt` файла списка покупок."""
+    media_type = 'text/plain'
+    format = 'txt'
+
+
+class CsvRenderer(ShoppingCartRenderer):
+    """Рендер `csv` файла списка покупок."""
+    media_type = 'text/csv'
+    format = 'csv'
+
+
+class JsonRenderer(ShoppingCartRenderer):
+    """Рендер `json` файла списка покупок."""
+    media_type = 'application/json'
+    format = 'json'
@@ -3,25 +3,47 @@ from collections import OrderedDict
 
 from django.core.files.base import ContentFile
 from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import transaction
+from django.db.models import Prefetch, prefetch_related_objects
 from rest_framework import serializers
 
 from recipes.constants import (MODEL_MAX_AMOUNT, MODEL_MAX_COOKING_TIME,
                                MODEL_MIN_VALUE,)
+from recipes.images import image_variant_urls
 from recipes.models import (FavoriteRecipes, Ingredient, Recipe,
                             RecipeIngredientAmount, ShoppingList, Tag,)
+from recipes.shopping_cart import change_recipe_in_shopping_carts
 from users.serializers import FoodgramUserSerializer
-from .tools import ingredients_bulk_create
-from .validators import (get_favorite_and_shopping_cart, validate_ingredients,
+from . import constants as con
+from .tools import ingredients_bulk_create, ingredients_update, tags_update
+from .validators import (get_favorite_and_shopping_cart, validate_image_header,
+                         validate_image_size, validate_ingredients,
                          validate_tags,)
 
+RECIPE_PREFETCH: tuple[Prefetch] = (
+    Prefetch('tags', queryset=Tag.objects.all()),
+    Prefetch(
+        'amount_recipe',
+        queryset=RecipeIngredientAmount.objects.select_related('ingredient'),
+    ),
+)
+
 
 class Base64ImageField(serializers.ImageField):
-    """Декодер `Base64` в изображение."""
+    """Декодер `Base64` в изображение.
+    - Размер проверяется по длине строки до декодирования,
+    размеры сторон по заголовку декодированного изображения.
+    - Файлы из `multipart` запроса проверены при загрузке
+    и передаются полю без изменений.
+    """
     def to_internal_value(self, data):
         if isinstance(data, str) and data.startswith('data:image'):
             format, imgstr = data.split(';base64,')
             ext = format.split('/')[-1]
-            data = ContentFile(base64.b64decode(imgstr), name='temp.' + ext)
+            validate_image_size(len(imgstr) * 3 // 4)
+            content = base64.b64decode(imgstr)
+            validate_image_header(content[:con.UPLOAD_MAX_HEADER_SIZE])
+            data = ContentFile(content, name='temp.' + ext)
 
         return super().to_internal_value(data)
 
@@ -85,6 +107,7 @@ class RecipeSerializer(serializers.ModelSerializer):
     )
     is_favorited = serializers.SerializerMethodField()
     is_in_shopping_cart = serializers.SerializerMethodField()
+    images = serializers.SerializerMethodField()
     cooking_time = serializers.IntegerField(
         validators=[
             MaxValueValidator(MODEL_MAX_COOKING_TIME),
@@ -103,6 +126,7 @@ class RecipeSerializer(serializers.ModelSerializer):
             'is_in_shopping_cart',
             'name',
             'image',
+            'images',
             'text',
             'cooking_time',
         )
@@ -116,6 +140,8 @@ class RecipeSerializer(serializers.ModelSerializer):
         Returns:
             - bool: В избранном пользователя или нет.
         """
+        if hasattr(obj, 'is_favorited'):
+            return obj.is_favorited
         return get_favorite_and_shopping_cart(
             FavoriteRecipes,
             self.context['request'].user,
@@ -131,30 +157,88 @@ class RecipeSerializer(serializers.ModelSerializer):
         Returns:
             - bool: В списке покупок пользователя или нет.
         """
+        if hasattr(obj, 'is_in_shopping_cart'):
+            return obj.is_in_shopping_cart
         return get_favorite_and_shopping_cart(
             ShoppingList,
             self.context['request'].user,
             obj.id
         )
 
+    def get_images(self, obj: Recipe) -> dict or None:
+        """Ссылки на уменьшенные копии изображения.
+
+        Args:
+            - obj (Recipe): Рецепт.
+
+        Returns:
+            - dict or None: Ссылки по вариантам и форматам
+            или ничего до обработки изображения.
+        """
+        return image_variant_urls(obj, self.context.get('request'))
+
+    def to_representation(self, instance: Recipe) -> OrderedDict:
+        """Передача подписки на автора из аннотации рецепта.
+        - Теги и ингредиенты без загруженного кеша
+        загружаются двумя запросами.
+
+        Args:
+            - instance (Recipe): Рецепт.
+
+        Returns:
+            - OrderedDict: Данные рецепта.
+        """
+        cache = getattr(instance, '_prefetched_objects_cache', {})
+        lookups = [
+            lookup for lookup in RECIPE_PREFETCH
+            if lookup.prefetch_to not in cache
+        ]
+        if lookups:
+            prefetch_related_objects([instance], *lookups)
+        if hasattr(instance, 'is_subscribed_author'):
+            instance.author.is_subscribed = instance.is_subscribed_author
+        return super().to_representation(instance)
+
     def validate(self, data: OrderedDict) -> OrderedDict:
         """Валидация полученных данных.
+        - Ошибки ингредиентов и тегов возвращаются вместе.
+        - При частичном обновлении проверяются только
+        переданные ингредиенты и теги.
+        - Ингредиенты и теги берутся из контекста `ingredients` и `tags`,
+        если загружены заранее для пакета рецептов.
 
         Args:
             - data (OrderedDict): Данные.
 
+        Raises:
+            - serializers.ValidationError: Ошибки ингредиентов и тегов.
+
         Returns:
             - OrderedDict: Валидированные данные.
         """
-        data['ingredients'] = validate_ingredients(
-            data.get('amount_recipe')
-        )
-        data.pop('amount_recipe')
-        data['tags'] = validate_tags(
-            self.initial_data.get('tags')
-        )
+        errors: dict = {}
+        if not self.partial or 'amount_recipe' in data:
+            try:
+                data['ingredients'] = validate_ingredients(
+                    data.get('amount_recipe'),
+                    self.context.get('ingredients'),
+                )
+            except serializers.ValidationError as error:
+                errors.update(error.detail)
+            data.pop('amount_recipe', None)
+        if not self.partial or 'tags' in self.initial_data:
+            try:
+                data['tags'] = validate_tags(
+                    self.initial_data.get('tags'),
+                    self.context.get('tags'),
+                )
+            except serializers.ValidationError as error:
+                errors.update(error.detail)
+        if errors:
+            raise serializers.ValidationError(errors)
         return data
 
+    @transaction.atomic
     def create(self, validated_data: dict) -> Recipe:
         """Создание рецепта.
 
@@ -171,8 +255,13 @@ class RecipeSerializer(serializers.ModelSerializer):
         ingredients_bulk_create(recipe, ingredients)
         return recipe
 
+    @transaction.atomic
     def update(self, instance: Recipe, validated_data: dict) -> Recipe:
         """Обновление рецепта.
+        - Теги и ингредиенты обновляются по разнице с текущими,
+        не переданные теги и ингредиенты не изменяются.
+        - Суммы списков покупок с рецептом изменяются
+        на разницу ингредиентов.
 
         Args:
             - instance (Recipe): Рецепт.
@@ -181,11 +270,18 @@ class RecipeSerializer(serializers.ModelSerializer):
         Returns:
             - Recipe: Обновленный рецепт.
         """
-        tags = validated_data.pop('tags')
-        instance.tags.set(tags)
-        ingredients = validated_data.pop('ingredients')
-        RecipeIngredientAmount.objects.filter(recipe=instance).delete()
-        ingredients_bulk_create(instance, ingredients)
+        if 'tags' in validated_data:
+            tags_update(instance, validated_data.pop('tags'))
+        if 'ingredients' in validated_data:
+            old_amounts, new_amounts = ingredients_update(
+                instance,
+                validated_data.pop('ingredients'),
+            )
+            change_recipe_in_shopping_carts(
+                instance.id,
+                old_amounts,
+                new_amounts,
+            )
         instance.name = validated_data.get('name', instance.name)
         instance.image = validated_data.get('image', instance.image)
         instance.text = validated_data.get('text', instance.text)
@@ -195,3 +291,21 @@ class RecipeSerializer(serializers.ModelSerializer):
         )
         instance.save()
         return instance
+
+
+class RecipeIdsSerializer(serializers.Serializer):
+    """Сериализатор списка ID рецептов для пакетных запросов."""
+    recipes = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=con.VALIDATE_BULK_MAX_RECIPES,
+    )
+
+
+class RecipeBulkSerializer(serializers.Serializer):
+    """Сериализатор пакета рецептов для пакетного создания."""
+    recipes = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=con.VALIDATE_BULK_MAX_RECIPES,
+    )
@@ -1,7 +1,14 @@
+from functools import partial
+
 from django.contrib.auth import get_user_model
+from django.db import connection, transaction
 from rest_framework import serializers
 
-from recipes.models import Recipe, RecipeIngredientAmount
+from recipes.feed import fan_out_recipes
+from recipes.images import image_variant_urls, schedule_image_variants
+from recipes.models import Recipe, RecipeIngredientAmount, Tag
+from recipes.storage import content_hash_storage
+from recipes.tools import change_counter
 
 User = get_user_model()
 
@@ -23,13 +30,214 @@ def ingredients_bulk_create(recipe: Recipe, ingredients: dict) -> None:
     )
 
 
+def ingredients_update(
+    recipe: Recipe,
+    ingredients: list[dict]
+) -> tuple[dict[int, int], dict[int, int]]:
+    """Обновление ингредиентов рецепта по разнице с текущими.
+    - Создаются новые, изменяются отличающиеся
+    и удаляются лишние ингредиенты, совпадающие не изменяются.
+
+    Args:
+        - recipe (Recipe): Рецепт.
+        - ingredients (list[dict]): Ингредиенты для рецепта.
+
+    Returns:
+        - tuple[dict[int, int], dict[int, int]]: Прежнее и новое
+        количество по ID ингредиента.
+    """
+    current: dict[int, RecipeIngredientAmount] = {
+        amount.ingredient_id: amount
+        for amount in recipe.amount_recipe.all()
+    }
+    old_amounts = {id: amount.amount for id, amount in current.items()}
+    new_amounts = {
+        ingredient['id'].id: ingredient['amount']
+        for ingredient in ingredients
+    }
+    created = [
+        ingredient for ingredient in ingredients
+        if ingredient['id'].id not in current
+    ]
+    changed = [
+        current[id] for id, amount in new_amounts.items()
+        if id in current and current[id].amount != amount
+    ]
+    deleted = [
+        amount.id for id, amount in current.items()
+        if id not in new_amounts
+    ]
+    if deleted:
+        RecipeIngredientAmount.objects.filter(id__in=deleted).delete()
+    if changed:
+        for amount in changed:
+            amount.amount = new_amounts[amount.ingredient_id]
+        RecipeIngredientAmount.objects.bulk_update(changed, ['amount'])
+    if created:
+        ingredients_bulk_create(recipe, created)
+    return old_amounts, new_amounts
+
+
+def tags_update(recipe: Recipe, tags: list[Tag]) -> None:
+    """Обновление тегов рецепта по разнице с текущими.
+
+    Args:
+        - recipe (Recipe): Рецепт.
+        - tags (list[Tag]): Теги для рецепта.
+    """
+    current = {tag.id for tag in recipe.tags.all()}
+    new = {tag.id for tag in tags}
+    if current - new:
+        recipe.tags.remove(*(current - new))
+    if new - current:
+        recipe.tags.add(*(new - current))
+
+
+def reference_ids(recipes: list[dict]) -> tuple[set[int], set[int]]:
+    """ID ингредиентов и тегов из пакета рецептов
+    для общей загрузки перед валидацией.
+
+    Args:
+        - recipes (list[dict]): Данные рецептов.
+
+    Returns:
+        - tuple[set[int], set[int]]: ID ингредиентов и ID тегов.
+    """
+    ingredients: set[int] = set()
+    tags: set[int] = set()
+    for data in recipes:
+        for ingredient in data.get('ingredients') or []:
+            if isinstance(ingredient, dict):
+                id = str(ingredient.get('id'))
+                if id.isdigit():
+                    ingredients.add(int(id))
+        for tag in data.get('tags') or []:
+            if str(tag).isdigit():
+                tags.add(int(tag))
+    return ingredients, tags
+
+
+def recipe_objects(author: User, recipes: list[dict]) -> list[Recipe]:
+    """Несохраненные рецепты пакета.
+
+    Args:
+        - author (User): Автор рецептов.
+        - recipes (list[dict]): Валидированные данные рецептов.
+
+    Returns:
+        - list[Recipe]: Рецепты без тегов и ингредиентов.
+    """
+    return [
+        Recipe(
+            author=author,
+            **{
+                field: value for field, value in data.items()
+                if field not in ('tags', 'ingredients')
+            }
+        )
+        for data in recipes
+    ]
+
+
+def recipes_bulk_create(
+    objs: list[Recipe],
+    recipes: list[dict]
+) -> list[Recipe]:
+    """Создание пакета рецептов одного автора.
+    - Рецепты, теги и ингредиенты создаются
+    одним `bulk_create` каждые.
+    - Без возврата ID из `bulk_create` (не `PostgreSQL`)
+    рецепты сохраняются по одному.
+    - `bulk_create` не вызывает сигналы, счетчик рецептов автора,
+    запись в ленты подписчиков и обработка изображений
+    запускаются здесь.
+
+    Args:
+        - objs (list[Recipe]): Рецепты из `recipe_objects`.
+        - recipes (list[dict]): Валидированные данные рецептов.
+
+    Returns:
+        - list[Recipe]: Созданные рецепты.
+    """
+    if not objs:
+        return []
+    if connection.features.can_return_rows_from_bulk_insert:
+        Recipe.objects.bulk_create(objs)
+        change_counter(
+            User.objects.filter(id=objs[0].author_id),
+            'recipes_count',
+            len(objs)
+        )
+        fan_out_recipes(objs)
+        for recipe in objs:
+            transaction.on_commit(
+                partial(schedule_image_variants, recipe.id, recipe.image.name)
+            )
+    else:
+        for recipe in objs:
+            recipe.save()
+    Recipe.tags.through.objects.bulk_create(
+        Recipe.tags.through(recipe_id=recipe.id, tag_id=tag.id)
+        for recipe, data in zip(objs, recipes)
+        for tag in data['tags']
+    )
+    RecipeIngredientAmount.objects.bulk_create(
+        RecipeIngredientAmount(
+            recipe=recipe,
+            ingredient=ingredient['id'],
+            amount=ingredient['amount']
+        )
+        for recipe, data in zip(objs, recipes)
+        for ingredient in data['ingredients']
+    )
+    return objs
+
+
+def delete_unused_images(recipes: list[Recipe]) -> None:
+    """Удаление изображений рецептов, не созданных из-за отката.
+    - Изображение сохраняется в хранилище при вставке рецепта
+    и остается после отката транзакции.
+    - Одинаковые изображения хранятся одним файлом,
+    файлы сохраненных рецептов не удаляются.
+
+    Args:
+        - recipes (list[Recipe]): Рецепты откатанной транзакции.
+    """
+    names = {
+        recipe.image.name for recipe in recipes
+        if recipe.image and recipe.image._committed
+    }
+    if not names:
+        return
+    names -= set(
+        Recipe.objects.filter(image__in=names).values_list('image', flat=True)
+    )
+    for name in names:
+        content_hash_storage.delete(name)
+
+
 class ShortRecipeSerialize(serializers.ModelSerializer):
     """Ограниченый сериализатор модели `Recipe`."""
+    images = serializers.SerializerMethodField()
+
     class Meta:
         model = Recipe
         fields = (
             'id',
             'name',
             'image',
+            'images',
             'cooking_time',
         )
+
+    def get_images(self, obj: Recipe) -> dict or None:
+        """Ссылки на уменьшенные копии изображения.
+
+        Args:
+            - obj (Recipe): Рецепт.
+
+        Returns:
+            - dict or None: Ссылки по вариантам и форматам
+            или ничего до обработки изображения.
+        """
+        return image_variant_urls(obj, self.context.get('request'))
@@ -1,7 +1,7 @@
 from django.urls import include, path, re_path
 from rest_framework.routers import DefaultRouter
 
-from users.views import FoodgramUserViewSet
+from users.views import FoodgramUserViewSet, TokenCacheStatsView
 from .views import IngredientViewSet, RecipeViewSet, TagViewSet
 
 router = DefaultRouter()
@@ -12,5 +12,10 @@ router.register('recipes', RecipeViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
+    path(
+        'auth/token/stats/',
+        TokenCacheStatsView.as_view(),
+        name='token-cache-stats',
+    ),
     re_path(r'^auth/', include('djoser.urls.authtoken')),
 ]
@@ -1,4 +1,8 @@
+from io import BytesIO
+
 from django.contrib.auth import get_user_model
+from django.db import connections, transaction
+from PIL import Image
 from rest_framework import serializers, status
 from rest_framework.exceptions import NotFound
 from rest_framework.request import Request
@@ -6,6 +10,8 @@ from rest_framework.response import Response
 
 from recipes.models import (FavoriteRecipes, Ingredient, Recipe, ShoppingList,
                             Tag,)
+from recipes.shopping_cart import change_shopping_cart, rebuild_shopping_cart
+from recipes.tools import change_counter, count_subquery
 from . import constants as con
 from .tools import ShortRecipeSerialize
 
@@ -35,88 +41,242 @@ def get_favorite_and_shopping_cart(
     ).exists()
 
 
-def validate_ingredients(ingredients: list[dict[str, int]]) -> list:
+def find_duplicates(ids: list[int]) -> list[int]:
+    """Повторяющиеся ID в порядке первого повтора.
+
+    Args:
+        - ids (list[int]): Список ID.
+
+    Returns:
+        - list[int]: Повторяющиеся ID без повторов.
+    """
+    seen: set[int] = set()
+    duplicates: dict[int, None] = {}
+    for id in ids:
+        if id in seen:
+            duplicates[id] = None
+        seen.add(id)
+    return list(duplicates)
+
+
+def format_ids(message: str, ids: list) -> str:
+    """Текст ошибки со списком ID.
+
+    Args:
+        - message (str): Текст ошибки.
+        - ids (list): Список ID.
+
+    Returns:
+        - str: Текст ошибки формата `текст: 1, 2`.
+    """
+    return f'{message}: {", ".join(str(id) for id in ids)}'
+
+
+def validate_ingredients(
+    ingredients: list[dict[str, int]],
+    found: dict[int, Ingredient] or None = None
+) -> list:
     """Валидация ингредиентов и их количества.
+    - Все ингредиенты загружаются одним запросом,
+    если не переданы загруженные заранее.
+    - В ошибке перечисляются все не найденные и повторяющиеся ID.
 
     Args:
         - ingredients (list[dict[str, int]]):
         Список ингредиентов и их количества.
+        - found (dict[int, Ingredient] or None): Загруженные заранее
+        ингредиенты по ID.
 
     Raises:
         - serializers.ValidationError:
             - Ингредиенты не были переданы.
-            - Ингредиент не был найден.
-            - Не указанно количество ингредиента.
-            - Ингредиент повторяется.
+            - Ингредиенты не были найдены.
+            - Ингредиенты повторяются.
 
     Returns:
         - list: Валидированный список ингредиентов и их количества.
     """
-    ingredient_list: list[dict[str, Ingredient or int] or None] = []
-    duplicate: list[Ingredient or None] = []
     if not ingredients:
         raise serializers.ValidationError(
             {'ingredients': con.VALIDATE_ERROR_NOT_INGREDIENTS},
             code=status.HTTP_400_BAD_REQUEST
         )
-    for ingredient in ingredients:
-        current_ingredient: Ingredient = Ingredient.objects.filter(
-            id=ingredient['ingredient']['id']
-        ).first()
-        if not current_ingredient:
-            raise serializers.ValidationError(
-                {'ingredients': con.VALIDATE_ERROR_NOT_FOUND_INGREDIENTS},
-                code=status.HTTP_400_BAD_REQUEST
-            )
-        elif current_ingredient in duplicate:
-            raise serializers.ValidationError(
-                {'ingredients': con.VALIDATE_ERROR_DUPLICATE_INGREDIENTS},
-                code=status.HTTP_400_BAD_REQUEST
-            )
-        duplicate.append(current_ingredient)
-        ingredient_list.append(
-            {'id': current_ingredient, 'amount': ingredient['amount']}
+    ids = [ingredient['ingredient']['id'] for ingredient in ingredients]
+    if found is None:
+        found = Ingredient.objects.in_bulk(set(ids))
+    errors: list[str] = []
+    missing = [id for id in dict.fromkeys(ids) if id not in found]
+    if missing:
+        errors.append(
+            format_ids(con.VALIDATE_ERROR_NOT_FOUND_INGREDIENTS, missing)
         )
-    return ingredient_list
+    duplicates = find_duplicates(ids)
+    if duplicates:
+        errors.append(
+            format_ids(con.VALIDATE_ERROR_DUPLICATE_INGREDIENTS, duplicates)
+        )
+    if errors:
+        raise serializers.ValidationError(
+            {'ingredients': errors},
+            code=status.HTTP_400_BAD_REQUEST
+        )
+    return [
+        {'id': found[id], 'amount': ingredient['amount']}
+        for id, ingredient in zip(ids, ingredients)
+    ]
 
 
-def validate_tags(tags: list[int]) -> list:
+def validate_tags(
+    tags: list[int],
+    found: dict[int, Tag] or None = None
+) -> list:
     """Валидация тегов.
+    - Все теги загружаются одним запросом,
+    если не переданы загруженные заранее.
+    - В ошибке перечисляются все не найденные и повторяющиеся ID.
 
     Args:
         - tags (list[int]): Список тегов
+        - found (dict[int, Tag] or None): Загруженные заранее теги по ID.
 
     Raises:
         - serializers.ValidationError:
             - Теги не были переданы.
-            - Тег не был найден.
-            - Тег повторяется.
+            - Теги не были найдены.
+            - Теги повторяются.
 
     Returns:
         - list: Валидированный список тегов.
     """
-    duplicate: list[Tag or None] = []
-    if not tags:
+    if not tags or not isinstance(tags, list):
         raise serializers.ValidationError(
             {'tags': con.VALIDATE_ERROR_NOT_TAGS},
             code=status.HTTP_400_BAD_REQUEST
         )
-    for tag in tags:
-        current_tag: Tag = Tag.objects.filter(id=tag).first()
-        if not current_tag:
-            raise serializers.ValidationError(
-                {'tags': con.VALIDATE_ERROR_NOT_FOUND_TAGS},
-                code=status.HTTP_400_BAD_REQUEST
-            )
-        elif tag in duplicate:
-            raise serializers.ValidationError(
-                {'tags': con.VALIDATE_ERROR_DUPLICATE_TAGS},
-                code=status.HTTP_400_BAD_REQUEST
+    ids = [int(tag) if str(tag).isdigit() else str(tag) for tag in tags]
+    if found is None:
+        found = Tag.objects.in_bulk(
+            {id for id in ids if isinstance(id, int)}
+        )
+    errors: list[str] = []
+    missing = [id for id in dict.fromkeys(ids) if id not in found]
+    if missing:
+        errors.append(format_ids(con.VALIDATE_ERROR_NOT_FOUND_TAGS, missing))
+    duplicates = find_duplicates(ids)
+    if duplicates:
+        errors.append(
+            format_ids(con.VALIDATE_ERROR_DUPLICATE_TAGS, duplicates)
+        )
+    if errors:
+        raise serializers.ValidationError(
+            {'tags': errors},
+            code=status.HTTP_400_BAD_REQUEST
+        )
+    return [found[id] for id in ids]
+
+
+def validate_image_size(size: int) -> None:
+    """Проверка размера изображения.
+
+    Args:
+        - size (int): Размер изображения в байтах.
+
+    Raises:
+        - serializers.ValidationError: Изображение слишком большое.
+    """
+    if size > con.UPLOAD_MAX_IMAGE_SIZE:
+        raise serializers.ValidationError(
+            con.VALIDATE_ERROR_IMAGE_SIZE.format(
+                con.UPLOAD_MAX_IMAGE_SIZE // (1024 * 1024)
             )
-        duplicate.append(tag)
-    return duplicate
+        )
+
+
+def validate_image_header(header: bytes) -> bool:
+    """Проверка размеров изображения по заголовку.
+    - Открытие изображения читает только заголовок без декодирования.
+    - Если заголовок получен не полностью, проверка откладывается
+    до следующей части файла.
+
+    Args:
+        - header (bytes): Начало файла изображения.
+
+    Raises:
+        - serializers.ValidationError: Сторона изображения слишком большая
+        или заголовок изображения не найден.
+
+    Returns:
+        - bool: Заголовок прочитан и проверен.
+    """
+    side_error = serializers.ValidationError(
+        con.VALIDATE_ERROR_IMAGE_SIDE.format(con.UPLOAD_MAX_IMAGE_SIDE)
+    )
+    try:
+        with Image.open(BytesIO(header)) as image:
+            width, height = image.size
+    except Image.DecompressionBombError:
+        raise side_error
+    except (OSError, SyntaxError, ValueError):
+        if len(header) < con.UPLOAD_MAX_HEADER_SIZE:
+            return False
+        raise serializers.ValidationError(con.VALIDATE_ERROR_NOT_IMAGE)
+    if max(width, height) > con.UPLOAD_MAX_IMAGE_SIDE:
+        raise side_error
+    return True
+
+
+def change_favorite_and_shopping_list(
+    model: any,
+    user_id: int,
+    recipe_id: int,
+    sign: int
+) -> None:
+    """Изменение счетчика избранного или сумм списка покупок.
+
+    Args:
+        - model (Model): Модель избранного или списка покупок.
+        - user_id (int): ID пользователя.
+        - recipe_id (int): ID рецепта.
+        - sign (int): `1` при добавлении, `-1` при удалении рецепта.
+    """
+    if model is FavoriteRecipes:
+        change_counter(
+            Recipe.objects.filter(id=recipe_id),
+            'favorite_count',
+            sign
+        )
+    elif model is ShoppingList:
+        change_shopping_cart(user_id, recipe_id, sign)
+
+
+def insert_recipe(model: any, user_id: int, recipe_id: int) -> bool:
+    """Добавление существующего рецепта в модель одним запросом.
+    - Строка вставляется только если рецепт существует,
+    повтор пропускается по ограничению уникальности.
+
+    Args:
+        - model (Model): Модель избранного или списка покупок.
+        - user_id (int): ID пользователя.
+        - recipe_id (int): ID рецепта.
+
+    Returns:
+        - bool: Рецепт добавлен.
+    """
+    connection = connections[model.objects.db]
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {quote(model._meta.db_table)} '
+            f'({quote("user_id")}, {quote("recipe_id")}) '
+            f'SELECT %s, {quote("id")} FROM {quote(Recipe._meta.db_table)} '
+            f'WHERE {quote("id")} = %s '
+            'ON CONFLICT DO NOTHING RETURNING 1',
+            (user_id, recipe_id),
+        )
+        return cursor.fetchone() is not None
 
 
+@transaction.atomic
 def validate_favorite_and_shopping_list(
     request: Request,
     method: str,
@@ -125,6 +285,12 @@ def validate_favorite_and_shopping_list(
     id: int
 ) -> Response:
     """Проверка и добавление рецепта в модель.
+    - Добавление выполняется одним `INSERT ... ON CONFLICT DO NOTHING`
+    без точки сохранения, повтор и отсутствие рецепта
+    определяются по пустому результату.
+    - Удаление выполняется одним `DELETE` с проверкой числа строк.
+    - Счетчик избранного и суммы списка покупок
+    изменяются только при успешном добавлении или удалении.
 
     Args:
         - request (Request): Запрос.
@@ -142,44 +308,151 @@ def validate_favorite_and_shopping_list(
         - Response: Добавление `post` или
         удаление `delete` рецепта в модель.
     """
-    recipe: Recipe = Recipe.objects.filter(id=id).first()
     if method == 'POST':
-        if not recipe:
-            raise serializers.ValidationError(
-                {'error': con.VALIDATE_ERROR_NOT_FOUND_RECIPE},
-                code=status.HTTP_400_BAD_REQUEST
-            )
-        obj = model.objects.filter(
-            user=user,
-            recipe=recipe,
-        )
-        if obj.exists():
+        if not insert_recipe(model, user.id, id):
+            if not Recipe.objects.filter(id=id).exists():
+                raise serializers.ValidationError(
+                    {'error': con.VALIDATE_ERROR_NOT_FOUND_RECIPE},
+                    code=status.HTTP_400_BAD_REQUEST
+                )
             raise serializers.ValidationError(
                 {'error': con.VALIDATE_ERROR_ADD_RECIPE},
                 code=status.HTTP_400_BAD_REQUEST
             )
-        obj = model.objects.create(
-            user=user,
-            recipe=recipe,
-        )
+        change_favorite_and_shopping_list(model, user.id, id, 1)
+        recipe: Recipe = Recipe.objects.get(id=id)
         serializer = ShortRecipeSerialize(
             recipe,
             context={'request': request},
         )
         return Response(serializer.data, status=status.HTTP_201_CREATED)
-    if not recipe:
+    deleted, _ = model.objects.filter(
+        user=user,
+        recipe=id,
+    ).delete()
+    if deleted:
+        change_favorite_and_shopping_list(model, user.id, id, -1)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    if not Recipe.objects.filter(id=id).exists():
         raise NotFound(
             {'error': con.VALIDATE_ERROR_NOT_FOUND_RECIPE},
             code=status.HTTP_404_NOT_FOUND
         )
-    obj = model.objects.filter(
-        user=user,
-        recipe=recipe,
-    )
-    if obj.exists():
-        obj.delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
     raise serializers.ValidationError(
         {'error': con.VALIDATE_ERROR_DELETE_RECIPE},
         code=status.HTTP_400_BAD_REQUEST,
     )
+
+
+def recount_favorite_and_shopping_list(
+    model: any,
+    user_id: int,
+    recipe_ids: list[int]
+) -> None:
+    """Пересчет счетчиков избранного или сумм списка покупок
+    после пакетного изменения.
+
+    Args:
+        - model (Model): Модель избранного или списка покупок.
+        - user_id (int): ID пользователя.
+        - recipe_ids (list[int]): ID измененных рецептов.
+    """
+    if not recipe_ids:
+        return
+    if model is FavoriteRecipes:
+        Recipe.objects.filter(id__in=recipe_ids).update(
+            favorite_count=count_subquery(FavoriteRecipes, 'recipe')
+        )
+    elif model is ShoppingList:
+        rebuild_shopping_cart(user_id)
+
+
+@transaction.atomic
+def validate_bulk_favorite_and_shopping_list(
+    request: Request,
+    method: str,
+    user: User,
+    model: any,
+    ids: list[int]
+) -> Response:
+    """Пакетное добавление или удаление рецептов в модели.
+    - Рецепты и имеющиеся записи загружаются одним запросом каждые,
+    добавление и удаление выполняются одним запросом.
+    - Для каждого ID возвращается статус как у одиночного запроса.
+
+    Args:
+        - request (Request): Запрос.
+        - method (str): Метод запроса.
+        - user (User): Пользователь.
+        - model (Model): Модель.
+        - ids (list[int]): ID рецептов.
+
+    Returns:
+        - Response: Результат для каждого ID рецепта.
+    """
+    ids = list(dict.fromkeys(ids))
+    existing: set[int] = set(
+        model.objects.filter(
+            user=user,
+            recipe__in=ids,
+        ).values_list('recipe', flat=True)
+    )
+    results: dict[int, dict] = {}
+    if method == 'POST':
+        recipes: dict[int, Recipe] = Recipe.objects.in_bulk(ids)
+        added = [
+            id for id in ids if id in recipes and id not in existing
+        ]
+        model.objects.bulk_create(
+            (model(user=user, recipe_id=id) for id in added),
+            ignore_conflicts=True,
+        )
+        recount_favorite_and_shopping_list(model, user.id, added)
+        for id in ids:
+            if id not in recipes:
+                results[id] = {
+                    'status': status.HTTP_400_BAD_REQUEST,
+                    'error': con.VALIDATE_ERROR_NOT_FOUND_RECIPE,
+                }
+            elif id in existing:
+                results[id] = {
+                    'status': status.HTTP_400_BAD_REQUEST,
+                    'error': con.VALIDATE_ERROR_ADD_RECIPE,
+                }
+            else:
+                results[id] = {
+                    'status': status.HTTP_201_CREATED,
+                    'recipe': ShortRecipeSerialize(
+                        recipes[id],
+                        context={'request': request},
+                    ).data,
+                }
+    else:
+        deleted = [id for id in ids if id in existing]
+        if deleted:
+            model.objects.filter(user=user, recipe__in=deleted).delete()
+        recount_favorite_and_shopping_list(model, user.id, deleted)
+        missing = [id for id in ids if id not in existing]
+        found: set[int] = set()
+        if missing:
+            found = set(
+                Recipe.objects.filter(
+                    id__in=missing
+                ).values_list('id', flat=True)
+            )
+        for id in ids:
+            if id in existing:
+                results[id] = {'status': status.HTTP_204_NO_CONTENT}
+            elif id in found:
+                results[id] = {
+                    'status': status.HTTP_400_BAD_REQUEST,
+                    'error': con.VALIDATE_ERROR_DELETE_RECIPE,
+                }
+            else:
+                results[id] = {
+                    'status': status.HTTP_404_NOT_FOUND,
+                    'error': con.VALIDATE_ERROR_NOT_FOUND_RECIPE,
+                }
+    return Response(
+        {'results': [{'id': id, **result} for id, result in results.items()]}
+    )
@@ -1,18 +1,39 @@
-from django.http import HttpResponse
-from rest_framework import filters, viewsets
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.db.models.query import QuerySet
+from django.http import HttpResponse, StreamingHttpResponse
+from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.parsers import JSONParser
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
-from recipes.models import (FavoriteRecipes, Ingredient, Recipe,
-                            RecipeIngredientAmount, ShoppingList, Tag,)
+from recipes.constants import SEARCH_RANKED_LIMIT
+from recipes.models import (FavoriteRecipes, Ingredient, Recipe, ShoppingList,
+                            Tag,)
+from recipes.search import ingredient_index, ranked_search
+from recipes.shopping_cart import (cached_chunks, shopping_cart_cache_key,
+                                   shopping_cart_rows,)
+from users.models import Follow
 from . import constants as con
+from .exports import EXPORTS, encode
 from .filters import RecipeFilter
-from .paginations import RecipeAndSubscriptionPagination
+from .paginations import (FeedCursorPagination,
+                          RecipeAndSubscriptionPagination,
+                          RecipeCursorPagination,)
+from .parsers import RecipeMultiPartParser
 from .permissions import AuthorOrReadOnly
-from .serializers import IngredientSerializer, RecipeSerializer, TagSerializer
-from .validators import validate_favorite_and_shopping_list
+from .renderers import CsvRenderer, JsonRenderer, TxtRenderer
+from .serializers import (RECIPE_PREFETCH, IngredientSerializer,
+                          RecipeBulkSerializer, RecipeIdsSerializer,
+                          RecipeSerializer, TagSerializer,)
+from .tools import (delete_unused_images, recipe_objects, recipes_bulk_create,
+                    reference_ids,)
+from .validators import (validate_bulk_favorite_and_shopping_list,
+                         validate_favorite_and_shopping_list,)
 
 
 class TagViewSet(viewsets.ReadOnlyModelViewSet):
@@ -28,14 +49,39 @@ class TagViewSet(viewsets.ReadOnlyModelViewSet):
 class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
     """Обработка запросов к `api/ingredients/`.
     - Запросы доступны любому пользователю только для чтения.
-    - Доступен поиск по полю `name`.
+    - Доступен поиск по началу поля `name` и ограничение `limit`.
+    - Доступен нечеткий поиск с ранжированием `mode=ranked`.
+    - Список отдается из индекса ингредиентов в памяти процесса.
     """
     queryset = Ingredient.objects.all()
     serializer_class = IngredientSerializer
     permission_classes = [AllowAny]
     pagination_class = None
-    filter_backends = [filters.SearchFilter]
-    search_fields = ('^name',)
+    filter_backends = []
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        """Поиск ингредиентов по названию.
+        - По умолчанию поиск по началу названия.
+        - `mode=ranked` включает нечеткий поиск с ранжированием.
+
+        Args:
+            - request (Request): Запрос.
+
+        Returns:
+            - Response: Найденные ингредиенты.
+        """
+        name = request.query_params.get(api_settings.SEARCH_PARAM, '')
+        limit = request.query_params.get('limit')
+        limit = int(limit) if limit and limit.isdigit() else None
+        if name and request.query_params.get('mode') == con.VIEW_SEARCH_RANKED:
+            ingredients = ranked_search(
+                name,
+                limit or SEARCH_RANKED_LIMIT,
+            )
+        else:
+            ingredients = ingredient_index.search(name, limit)
+        serializer = self.get_serializer(ingredients, many=True)
+        return Response(serializer.data)
 
 
 class RecipeViewSet(viewsets.ModelViewSet):
@@ -47,12 +93,83 @@ class RecipeViewSet(viewsets.ModelViewSet):
         - `tags`
         - `is_favorited`
         - `is_in_shopping_cart`
+    - Параметр `cursor` включает курсорную пагинацию.
+    - Лента рецептов подписок доступна в `api/recipes/feed/`.
+    - Рецепт принимается в `JSON` с изображением в `Base64`
+    или в `multipart` с файлом изображения.
     """
-    queryset = Recipe.objects.all()
+    queryset = Recipe.objects.select_related(
+        'author',
+    ).prefetch_related(
+        *RECIPE_PREFETCH,
+    )
     serializer_class = RecipeSerializer
     filterset_class = RecipeFilter
     pagination_class = RecipeAndSubscriptionPagination
     permission_classes = [AuthorOrReadOnly, ]
+    parser_classes = [JSONParser, RecipeMultiPartParser]
+
+    @property
+    def paginator(
+        self
+    ) -> RecipeAndSubscriptionPagination or RecipeCursorPagination:
+        """Пагинация рецептов.
+        - Курсорная если в запросе передан параметр `cursor`.
+        - Курсорная по ленте подписок для `feed`.
+
+        Returns:
+            - RecipeAndSubscriptionPagination or RecipeCursorPagination:
+            Пагинация.
+        """
+        if not hasattr(self, '_paginator'):
+            request = getattr(self, 'request', None)
+            if getattr(self, 'action', None) == 'feed':
+                self._paginator = FeedCursorPagination()
+            elif (
+                request is not None
+                and RecipeCursorPagination.cursor_query_param
+                in request.query_params
+            ):
+                self._paginator = RecipeCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    def get_queryset(self) -> QuerySet:
+        """Рецепты с отметками избранного, списка покупок и подписки.
+        - Автор, теги и ингредиенты загружаются заранее
+        постоянным числом запросов.
+        - Для авторизованного пользователя поля `is_favorited`,
+        `is_in_shopping_cart` и подписка на автора
+        вычисляются подзапросами `Exists`.
+
+        Returns:
+            - QuerySet: Рецепты.
+        """
+        queryset = super().get_queryset()
+        user = self.request.user
+        if user.is_authenticated:
+            queryset = queryset.annotate(
+                is_favorited=Exists(
+                    FavoriteRecipes.objects.filter(
+                        user=user,
+                        recipe=OuterRef('pk'),
+                    )
+                ),
+                is_in_shopping_cart=Exists(
+                    ShoppingList.objects.filter(
+                        user=user,
+                        recipe=OuterRef('pk'),
+                    )
+                ),
+                is_subscribed_author=Exists(
+                    Follow.objects.filter(
+                        user=user,
+                        following=OuterRef('author'),
+                    )
+                ),
+            )
+        return queryset
 
     def perform_create(
         self,
@@ -123,39 +240,191 @@ class RecipeViewSet(viewsets.ModelViewSet):
             pk
         )
 
+    @action(
+        methods=['post'],
+        detail=False,
+        permission_classes=[IsAuthenticated],
+    )
+    def bulk(self, request: Request) -> Response:
+        """Обработка запросов к `api/recipes/bulk`.
+        - Запросы доступны авторизованному пользователю.
+        - В теле запроса передается список рецептов `recipes`.
+        - Ингредиенты и теги всех рецептов загружаются
+        одним запросом каждые.
+        - Корректные рецепты создаются в одной транзакции,
+        для остальных возвращаются ошибки.
+        - При откате транзакции удаляются сохраненные
+        изображения рецептов.
+
+        Args:
+            - request (Request): Запрос.
+
+        Returns:
+            - Response: Результат для каждого рецепта.
+        """
+        serializer = RecipeBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data['recipes']
+        results: list[dict] = []
+        objs: list[Recipe] = []
+        try:
+            with transaction.atomic():
+                ingredient_ids, tag_ids = reference_ids(items)
+                context = {
+                    **self.get_serializer_context(),
+                    'ingredients': Ingredient.objects.in_bulk(ingredient_ids),
+                    'tags': Tag.objects.in_bulk(tag_ids),
+                }
+                valid: list[dict] = []
+                for index, item in enumerate(items):
+                    serializer = RecipeSerializer(data=item, context=context)
+                    if serializer.is_valid():
+                        valid.append(serializer.validated_data)
+                        results.append({'index': index})
+                    else:
+                        results.append({
+                            'index': index,
+                            'status': status.HTTP_400_BAD_REQUEST,
+                            'errors': serializer.errors,
+                        })
+                objs = recipe_objects(request.user, valid)
+                recipes = iter(recipes_bulk_create(objs, valid))
+        except Exception:
+            delete_unused_images(objs)
+            raise
+        for result in results:
+            if 'status' not in result:
+                result['status'] = status.HTTP_201_CREATED
+                result['id'] = next(recipes).id
+        return Response({'results': results})
+
     @action(
         methods=['get'],
         detail=False,
         permission_classes=[IsAuthenticated],
     )
-    def download_shopping_cart(self, request: Request) -> HttpResponse:
+    def feed(self, request: Request) -> Response:
+        """Обработка запросов к `api/recipes/feed`.
+        - Запросы доступны авторизованному пользователю.
+        - Рецепты авторов подписок от новых к старым
+        с курсорной пагинацией `cursor` и `limit`.
+
+        Args:
+            - request (Request): Запрос.
+
+        Returns:
+            - Response: Страница ленты рецептов.
+        """
+        recipes = self.paginate_queryset(self.get_queryset())
+        serializer = self.get_serializer(recipes, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    def bulk_favorite_and_shopping_list(
+        self,
+        request: Request,
+        model: any
+    ) -> Response:
+        """Пакетное добавление или удаление рецептов в модели.
+
+        Args:
+            - request (Request): Запрос.
+            - model (Model): Модель избранного или списка покупок.
+
+        Returns:
+            - Response: Результат для каждого ID рецепта.
+        """
+        serializer = RecipeIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return validate_bulk_favorite_and_shopping_list(
+            request,
+            request.method,
+            request.user,
+            model,
+            serializer.validated_data['recipes'],
+        )
+
+    @action(
+        methods=['post', 'delete'],
+        detail=False,
+        permission_classes=[IsAuthenticated],
+    )
+    def bulk_favorite(self, request: Request) -> Response:
+        """Обработка запросов к `api/recipes/bulk_favorite`.
+        - Запросы доступны авторизованному пользователю.
+        - В теле запроса передается список ID рецептов `recipes`.
+
+        Args:
+            - request (Request): Запрос.
+
+        Returns:
+            - Response: Добавление `post` или
+            удаление `delete` рецептов в избранном.
+        """
+        return self.bulk_favorite_and_shopping_list(request, FavoriteRecipes)
+
+    @action(
+        methods=['post', 'delete'],
+        detail=False,
+        permission_classes=[IsAuthenticated],
+    )
+    def bulk_shopping_cart(self, request: Request) -> Response:
+        """Обработка запросов к `api/recipes/bulk_shopping_cart`.
+        - Запросы доступны авторизованному пользователю.
+        - В теле запроса передается список ID рецептов `recipes`.
+
+        Args:
+            - request (Request): Запрос.
+
+        Returns:
+            - Response: Добавление `post` или
+            удаление `delete` рецептов в список покупок.
+        """
+        return self.bulk_favorite_and_shopping_list(request, ShoppingList)
+
+    @action(
+        methods=['get'],
+        detail=False,
+        permission_classes=[IsAuthenticated],
+        renderer_classes=[TxtRenderer, CsvRenderer, JsonRenderer],
+    )
+    def download_shopping_cart(
+        self,
+        request: Request
+    ) -> HttpResponse or StreamingHttpResponse:
         """Обработка запросов к `api/recipes/download_shopping_cart`.
         - Запросы доступны авторизованному пользователю.
+        - Параметр `format` задает формат файла `txt`, `csv` или `json`.
+        - Файл отдается потоком и сохраняется в кеш
+        до изменения списка покупок.
 
         Args:
             - request (Request): Запрос.
 
         Returns:
-            - HttpResponse: `txt` файл со списком ингредиентов.
+            - HttpResponse or StreamingHttpResponse: Файл
+            со списком ингредиентов.
         """
-        ingredients: dict = {}
-        objs = RecipeIngredientAmount.objects.filter(
-            recipe__shop_recipe__user=self.request.user
+        renderer = request.accepted_renderer
+        key = shopping_cart_cache_key(request.user.id, renderer.format)
+        content = cache.get(key)
+        if content is not None:
+            response = HttpResponse(content)
+        else:
+            response = StreamingHttpResponse(
+                cached_chunks(
+                    key,
+                    encode(
+                        EXPORTS[renderer.format](
+                            shopping_cart_rows(request.user.id)
+                        )
+                    ),
+                )
+            )
+        response['Content-Type'] = (
+            f'{renderer.media_type}; charset={renderer.charset}'
         )
-        for obj in objs:
-            name: str = obj.ingredient.name
-            measurement_unit: str = obj.ingredient.measurement_unit
-            amount: int = obj.amount
-            if name in ingredients:
-                ingredients[name]['amount'] += amount
-            else:
-                ingredients[name] = {
-                    'amount': amount,
-                    'measurement_unit': measurement_unit
-                }
-        message: str = f'{con.VIEW_DOWNLOAD_HEAD}\n'
-        for ingredient, data in ingredients.items():
-            measurement_unit: str = data['measurement_unit']
-            amount: int = data['amount']
-            message += f'{ingredient} {amount} {measurement_unit}\n'
-        return HttpResponse(message, content_type='text/plain')
+        response['Content-Disposition'] = (
+            'attachment; '
+            f'filename="{con.VIEW_DOWNLOAD_FILENAME}.{renderer.format}"'
+        )
+        return response
@@ -1,9 +1,19 @@
 from django.contrib import admin
+from django.db import transaction
+from django.db.models import Manager, Model
+from django.db.models.query import QuerySet
+from django.forms import ModelForm
+from django.http import HttpRequest
 from django.utils.safestring import SafeString, mark_safe
 
 from . import constants as con
+from .images import image_variant_urls
 from .models import (FavoriteRecipes, Ingredient, Recipe,
                      RecipeIngredientAmount, ShoppingList, Tag,)
+from .shopping_cart import (change_recipe_in_shopping_carts,
+                            change_shopping_cart, rebuild_shopping_cart,
+                            recipe_amounts,)
+from .tools import change_counter, count_subquery
 
 admin.site.empty_value_display = con.ADMIN_EMPTY_VALUE
 
@@ -22,12 +32,18 @@ class RecipeAdmin(admin.ModelAdmin):
     @admin.display(description=con.ADMIN_NAME_GET_IMAGE)
     def get_image(self, obj: Recipe) -> SafeString:
         """Получение изображения в админ-зону.
+        - Используется уменьшенная копия изображения,
+        до ее создания оригинал масштабируется браузером.
+
         Args:
             - obj (Recipe): Рецепт.
 
         Returns:
             - SafeString: Изображение или ничего.
         """
+        variants = image_variant_urls(obj)
+        if variants:
+            return mark_safe(f'<img src="{variants["admin"]["jpeg"]}">')
         if obj.image:
             url: str = obj.image.url
             return mark_safe(
@@ -37,7 +53,10 @@ class RecipeAdmin(admin.ModelAdmin):
             )
         return ''
 
-    @admin.display(description=con.ADMIN_NAME_GET_FAVORITE_COUNT)
+    @admin.display(
+        description=con.ADMIN_NAME_GET_FAVORITE_COUNT,
+        ordering='favorite_count',
+    )
     def get_favorite_count(self, obj: Recipe) -> int:
         """Число добавлений в избранное.
 
@@ -47,7 +66,7 @@ class RecipeAdmin(admin.ModelAdmin):
         Returns:
             - int: Сколько раз добавили в избранное.
         """
-        return obj.favorite_recipe.count()
+        return obj.favorite_count
     readonly_fields = ('get_favorite_count', 'pub_data', 'get_image',)
     fieldsets = [
         (
@@ -82,6 +101,27 @@ class RecipeAdmin(admin.ModelAdmin):
         'name',
     )
 
+    def save_related(
+        self,
+        request: HttpRequest,
+        form: ModelForm,
+        formsets: list,
+        change: bool
+    ) -> None:
+        """Сохранение тегов и ингредиентов рецепта.
+        - Суммы списков покупок с рецептом изменяются
+        на разницу ингредиентов, как при обновлении через API.
+        """
+        recipe_id: int = form.instance.id
+        old_amounts = recipe_amounts(recipe_id) if change else {}
+        super().save_related(request, form, formsets, change)
+        if change:
+            change_recipe_in_shopping_carts(
+                recipe_id,
+                old_amounts,
+                recipe_amounts(recipe_id),
+            )
+
 
 @admin.register(Tag)
 class TagAdmin(admin.ModelAdmin):
@@ -117,5 +157,108 @@ class IngredientAdmin(admin.ModelAdmin):
     )
 
 
-admin.site.register(FavoriteRecipes)
-admin.site.register(ShoppingList)
+class UserRecipeAdmin(admin.ModelAdmin):
+    """Базовая регистрация моделей рецептов пользователя в админ-зоне.
+    - Изменения синхронизируются так же, как при запросах к API.
+
+    Attributes:
+        - counter_field (str or None): Поле счетчика рецепта.
+        - counter_manager (Manager): Менеджер моделей со счетчиком.
+        - shopping_cart (bool): Изменять суммы списка покупок.
+    """
+    list_display = (
+        'user',
+        'recipe',
+    )
+    search_fields = (
+        'user__username',
+        'recipe__name',
+    )
+    counter_field: str or None = None
+    counter_manager: Manager = Recipe.objects
+    shopping_cart: bool = False
+
+    def sync_recipe(self, user_id: int, recipe_id: int, sign: int) -> None:
+        """Синхронизация после добавления или удаления рецепта.
+
+        Args:
+            - user_id (int): ID пользователя.
+            - recipe_id (int): ID рецепта.
+            - sign (int): `1` при добавлении, `-1` при удалении рецепта.
+        """
+        if self.counter_field:
+            change_counter(
+                self.counter_manager.filter(id=recipe_id),
+                self.counter_field,
+                sign
+            )
+        if self.shopping_cart:
+            change_shopping_cart(user_id, recipe_id, sign)
+
+    def recount(self, rows: list[tuple[int, int]]) -> None:
+        """Синхронизация после удаления нескольких записей.
+
+        Args:
+            - rows (list[tuple[int, int]]): ID пользователей и рецептов
+            удаленных записей.
+        """
+        if self.counter_field:
+            self.counter_manager.filter(
+                id__in={recipe_id for _, recipe_id in rows}
+            ).update(
+                **{self.counter_field: count_subquery(self.model, 'recipe')}
+            )
+        if self.shopping_cart:
+            for user_id in {user_id for user_id, _ in rows}:
+                rebuild_shopping_cart(user_id)
+
+    @transaction.atomic
+    def save_model(
+        self,
+        request: HttpRequest,
+        obj: Model,
+        form: ModelForm,
+        change: bool
+    ) -> None:
+        old: tuple[int, int] or None = None
+        if change:
+            old = self.model.objects.filter(
+                pk=obj.pk
+            ).values_list('user', 'recipe').get()
+        super().save_model(request, obj, form, change)
+        if old == (obj.user_id, obj.recipe_id):
+            return
+        if old:
+            self.sync_recipe(*old, -1)
+        self.sync_recipe(obj.user_id, obj.recipe_id, 1)
+
+    @transaction.atomic
+    def delete_model(self, request: HttpRequest, obj: Model) -> None:
+        super().delete_model(request, obj)
+        self.sync_recipe(obj.user_id, obj.recipe_id, -1)
+
+    @transaction.atomic
+    def delete_queryset(
+        self,
+        request: HttpRequest,
+        queryset: QuerySet
+    ) -> None:
+        rows = list(queryset.values_list('user', 'recipe'))
+        super().delete_queryset(request, queryset)
+        self.recount(rows)
+
+
+@admin.register(FavoriteRecipes)
+class FavoriteRecipesAdmin(UserRecipeAdmin):
+    """Регистрация модели избранного в админ-зоне.
+    - Счетчик избранного рецепта изменяется вместе с записью.
+    """
+    counter_field = 'favorite_count'
+
+
+@admin.register(ShoppingList)
+class ShoppingListAdmin(UserRecipeAdmin):
+    """Регистрация модели списка покупок в админ-зоне.
+    - Суммы ингредиентов списка покупок изменяются вместе с записью.
+    """
+    shopping_cart = True
@@ -0,0 +1,22 @@
+from django.core.checks import Tags, Warning, register
+
+from . import constants as con
+from .tools import process_local_cache
+
+
+@register(Tags.caches)
+def check_version_cache(app_configs: any, **kwargs) -> list[Warning]:
+    """Проверка кеша версий каталога ингредиентов и списков покупок.
+
+    Returns:
+        - list[Warning]: Предупреждение, если кеш не общий для процессов.
+    """
+    if not process_local_cache():
+        return []
+    return [
+        Warning(
+            con.CHECK_PROCESS_LOCAL_CACHE,
+            hint=con.CHECK_PROCESS_LOCAL_CACHE_HINT,
+            id='recipes.W001',
+        )
+    ]
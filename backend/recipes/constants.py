@@ -19,6 +19,8 @@ MODEL_NAME_PUB_DATA: str = 'Дата публикации'
 MODEL_NAME_RECIPE: str = 'Рецепт'
 MODEL_NAME_AMOUNT: str = 'Количество'
 MODEL_NAME_USER: str = 'Пользователь'
+MODEL_NAME_FAVORITE_COUNT: str = 'В избранном'
+MODEL_NAME_IMAGE_VARIANTS: str = 'Варианты изображения'
 MODEL_ERROR_COOKING_TIME: str = 'Время приготовления не может быть'
 MODEL_ERROR_AMOUNT: str = 'Количество ингредиента не может быть'
 
@@ -32,6 +34,100 @@ ADMIN_NAME_GET_FAVORITE_COUNT: str = 'В избранном'
 COMMAND_HELP: str = 'Импорт данных для foodgram из csv в базу данных.'
 COMMAND_START: str = 'Импорт данных запущен'
 COMMAND_END: str = 'Импорт данных завершен'
+COMMAND_RECOUNT_HELP: str = (
+    'Пересчет счетчиков избранного, рецептов и подписчиков.'
+)
+COMMAND_RECOUNT_START: str = 'Пересчет счетчиков запущен'
+COMMAND_RECOUNT_END: str = 'Пересчет счетчиков завершен'
+COMMAND_CARTS_HELP: str = (
+    'Пересборка суммарных ингредиентов списков покупок.'
+)
+COMMAND_CARTS_START: str = 'Пересборка списков покупок запущена'
+COMMAND_CARTS_END: str = 'Пересборка списков покупок завершена'
+COMMAND_IMAGES_HELP: str = (
+    'Создание уменьшенных копий и WebP вариантов изображений рецептов.'
+)
+COMMAND_IMAGES_START: str = 'Обработка изображений запущена'
+COMMAND_IMAGES_END: str = 'Обработка изображений завершена'
+COMMAND_MEDIA_HELP: str = (
+    'Удаление файлов изображений, на которые не ссылаются рецепты.'
+)
+COMMAND_MEDIA_START: str = 'Сборка неиспользуемых файлов запущена'
+COMMAND_MEDIA_END: str = 'Сборка неиспользуемых файлов завершена'
+COMMAND_FEEDS_HELP: str = (
+    'Пересборка лент рецептов подписок пользователей.'
+)
+COMMAND_FEEDS_START: str = 'Пересборка лент подписок запущена'
+COMMAND_FEEDS_END: str = 'Пересборка лент подписок завершена'
+
+"""Константы поиска."""
+SEARCH_VERSION_KEY: str = 'ingredient_index_version'
+SEARCH_MAX_CHAR: str = chr(0x10FFFF)
+SEARCH_SIMILARITY_THRESHOLD: float = 0.3
+SEARCH_RANKED_LIMIT: int = 20
+SEARCH_RANK_PREFIX: int = 2
+SEARCH_RANK_SUBSTRING: int = 1
+SEARCH_SUBSTRING_SIZE: int = 3
+
+"""Константы списка покупок."""
+SHOPPING_CART_VERSION_KEY: str = 'shopping_cart_version'
+SHOPPING_CART_CACHE_KEY: str = 'shopping_cart'
+SHOPPING_CART_CACHE_TIMEOUT: int = 60 * 60 * 24
+SHOPPING_CART_CACHE_MAX_SIZE: int = 1024 * 1024
+SHOPPING_CART_CHUNK_SIZE: int = 2000
+
+"""Константы единиц измерения."""
+UNITS: dict[str, tuple[str, int]] = {
+    'г': ('г', 1),
+    'гр': ('г', 1),
+    'кг': ('г', 1000),
+    'мл': ('мл', 1),
+    'л': ('мл', 1000),
+    'ч. л.': ('мл', 5),
+    'ст. л.': ('мл', 15),
+    'стакан': ('мл', 200),
+    'шт': ('шт.', 1),
+    'шт.': ('шт.', 1),
+    'десяток': ('шт.', 10),
+}
+UNITS_DISPLAY: dict[str, tuple[tuple[str, int]]] = {
+    'г': (('кг', 1000), ('г', 1)),
+    'мл': (('л', 1000), ('мл', 1)),
+    'шт.': (('шт.', 1),),
+}
+
+"""Константы изображений."""
+IMAGE_VARIANTS: dict[str, tuple[int, int]] = {
+    'card': (480, 480),
+    'detail': (1200, 1200),
+    'admin': (ADMIN_SIZE_IMAGE, ADMIN_SIZE_IMAGE),
+}
+IMAGE_FORMATS: dict[str, tuple[str, str]] = {
+    'jpeg': ('JPEG', 'jpg'),
+    'webp': ('WEBP', 'webp'),
+}
+IMAGE_QUALITY: int = 85
+IMAGE_VARIANTS_DIR: str = 'recipe/variants/'
+IMAGE_SOURCE_KEY: str = 'source'
+IMAGE_BATCH_SIZE: int = 100
+IMAGE_UPLOAD_DIR: str = 'recipe/images/'
+IMAGE_ORPHAN_MIN_AGE: int = 60 * 60
 
 """Константы инструментов."""
 TOOL_MIN_IN_H: int = 60
+
+"""Константы ленты подписок."""
+FEED_FANOUT_MAX_FOLLOWERS: int = 1000
+FEED_FANOUT_MIN_FOLLOWERS: int = 800
+FEED_BATCH_SIZE: int = 1000
+
+"""Константы проверок."""
+CHECK_PROCESS_LOCAL_CACHE: str = (
+    'Кеш `default` не общий для процессов: версии каталога ингредиентов '
+    'и списков покупок, измененные management командами, '
+    'не видны процессам сервера.'
+)
+CHECK_PROCESS_LOCAL_CACHE_HINT: str = (
+    'Укажите общий кеш в `FOODGRAM_CACHE_BACKEND` '
+    'или перезапустите сервер после команд.'
+)
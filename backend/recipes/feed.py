@@ -0,0 +1,180 @@
+from collections.abc import Iterable
+
+from django.contrib.auth import get_user_model
+
+from users.models import Follow
+from . import constants as con
+from .models import FeedRecipe, Recipe
+
+User = get_user_model()
+
+
+def fan_out_recipes(recipes: Iterable[Recipe]) -> int:
+    """Запись новых рецептов в ленты подписчиков авторов.
+    - Подписчики всех авторов выбираются одним запросом,
+    записи ленты создаются пачками.
+    - Рецепты авторов с `feed_direct` не записываются,
+    лента читает их напрямую.
+
+    Args:
+        - recipes (Iterable[Recipe]): Созданные рецепты.
+
+    Returns:
+        - int: Количество созданных записей ленты.
+    """
+    by_author: dict[int, list[Recipe]] = {}
+    for recipe in recipes:
+        by_author.setdefault(recipe.author_id, []).append(recipe)
+    if not by_author:
+        return 0
+    followers = Follow.objects.filter(
+        following__in=by_author,
+        following__feed_direct=False,
+    ).order_by().values_list('user', 'following')
+    created = FeedRecipe.objects.bulk_create(
+        (
+            FeedRecipe(
+                user_id=user,
+                author_id=author,
+                recipe_id=recipe.id,
+                pub_data=recipe.pub_data,
+            )
+            for user, author in followers
+            for recipe in by_author[author]
+        ),
+        batch_size=con.FEED_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    return len(created)
+
+
+def backfill_feed(user_id: int, author_id: int) -> int:
+    """Запись рецептов автора в ленту нового подписчика.
+
+    Args:
+        - user_id (int): ID подписчика.
+        - author_id (int): ID автора.
+
+    Returns:
+        - int: Количество созданных записей ленты.
+    """
+    created = FeedRecipe.objects.bulk_create(
+        (
+            FeedRecipe(
+                user_id=user_id,
+                author_id=author_id,
+                recipe_id=recipe,
+                pub_data=pub_data,
+            )
+            for recipe, pub_data in Recipe.objects.filter(
+                author=author_id,
+                author__feed_direct=False,
+            ).order_by().values_list('id', 'pub_data')
+        ),
+        batch_size=con.FEED_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    return len(created)
+
+
+def refill_author_feeds(author_id: int) -> int:
+    """Запись рецептов автора в ленты всех подписчиков.
+    - Нужна, когда рецепты автора снова записываются в ленты:
+    рецепты, созданные до этого, в ленты не записывались.
+
+    Args:
+        - author_id (int): ID автора.
+
+    Returns:
+        - int: Количество созданных записей ленты.
+    """
+    recipes = Recipe.objects.filter(
+        author=author_id,
+    ).order_by().only('id', 'author_id', 'pub_data')
+    return fan_out_recipes(recipes)
+
+
+def switch_to_direct_read(author_id: int) -> bool:
+    """Отключение записи рецептов автора в ленты.
+    - Выполняется, когда подписчиков больше `FEED_FANOUT_MAX_FOLLOWERS`.
+
+    Args:
+        - author_id (int): ID автора.
+
+    Returns:
+        - bool: Автор переключен на чтение рецептов напрямую.
+    """
+    return bool(
+        User.objects.filter(
+            id=author_id,
+            feed_direct=False,
+            followers_count__gt=con.FEED_FANOUT_MAX_FOLLOWERS,
+        ).update(feed_direct=True)
+    )
+
+
+def switch_to_fan_out(author_id: int) -> bool:
+    """Включение записи рецептов автора в ленты.
+    - Выполняется, когда подписчиков не больше
+    `FEED_FANOUT_MIN_FOLLOWERS`. Разрыв между порогами
+    не дает пересобирать ленты при каждой подписке и отписке
+    у порога.
+    - Рецепты автора записываются в ленты всех подписчиков.
+
+    Args:
+        - author_id (int): ID автора.
+
+    Returns:
+        - bool: Автор переключен на запись рецептов в ленты.
+    """
+    switched = User.objects.filter(
+        id=author_id,
+        feed_direct=True,
+        followers_count__lte=con.FEED_FANOUT_MIN_FOLLOWERS,
+    ).update(feed_direct=False)
+    if switched:
+        refill_author_feeds(author_id)
+    return bool(switched)
+
+
+def update_feed_modes() -> None:
+    """Переключение всех авторов по порогам подписчиков.
+    - Авторы между `FEED_FANOUT_MIN_FOLLOWERS`
+    и `FEED_FANOUT_MAX_FOLLOWERS` не переключаются.
+    """
+    User.objects.filter(
+        feed_direct=False,
+        followers_count__gt=con.FEED_FANOUT_MAX_FOLLOWERS,
+    ).update(feed_direct=True)
+    User.objects.filter(
+        feed_direct=True,
+        followers_count__lte=con.FEED_FANOUT_MIN_FOLLOWERS,
+    ).update(feed_direct=False)
+
+
+def trim_feed(user_id: int, author_id: int) -> None:
+    """Удаление рецептов автора из ленты бывшего подписчика.
+
+    Args:
+        - user_id (int): ID подписчика.
+        - author_id (int): ID автора.
+    """
+    FeedRecipe.objects.filter(user=user_id, author=author_id).delete()
+
+
+def read_authors(user_id: int) -> list[int]:
+    """Авторы подписок, рецепты которых читаются напрямую.
+    - Рецепты авторов с `feed_direct` в ленты не записываются.
+
+    Args:
+        - user_id (int): ID пользователя.
+
+    Returns:
+        - list[int]: ID авторов.
+    """
+    return list(
+        User.objects.filter(
+            follow_following__user=user_id,
+            feed_direct=True,
+        ).values_list('id', flat=True)
+    )
@@ -0,0 +1,151 @@
+import logging
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from multiprocessing import get_context
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections
+from django.http import HttpRequest
+
+from . import constants as con
+from .models import Recipe
+from .storage import content_hash_storage
+from .thumbnails import make_variants, variant_name
+
+logger = logging.getLogger(__name__)
+
+_executor: ProcessPoolExecutor or None = None
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Пул процессов обработки изображений.
+    - Пул создается при первой обработке в каждом воркере.
+    - Процессы запускаются через `spawn`, чтобы не копировать
+    соединения и потоки воркера.
+
+    Returns:
+        - ProcessPoolExecutor: Пул процессов.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.FOODGRAM_IMAGE_WORKERS,
+            mp_context=get_context('spawn'),
+        )
+    return _executor
+
+
+def save_image_variants(
+    recipe_id: int,
+    source: str,
+    variants: dict[str, dict[str, bytes]]
+) -> dict:
+    """Сохранение вариантов изображения рецепта.
+    - Файлы сохраняются под именами от исходного изображения,
+    старые файлы с теми же именами заменяются.
+    - Варианты записываются в рецепт, только если
+    изображение рецепта не изменилось.
+
+    Args:
+        - recipe_id (int): ID рецепта.
+        - source (str): Имя исходного изображения.
+        - variants (dict[str, dict[str, bytes]]): Содержимое файлов.
+
+    Returns:
+        - dict: Имена файлов по вариантам и форматам.
+    """
+    names: dict = {con.IMAGE_SOURCE_KEY: source}
+    for variant, formats in variants.items():
+        names[variant] = {}
+        for format, content in formats.items():
+            name = variant_name(source, variant, con.IMAGE_FORMATS[format][1])
+            default_storage.delete(name)
+            names[variant][format] = default_storage.save(
+                name,
+                ContentFile(content),
+            )
+    Recipe.objects.filter(
+        id=recipe_id,
+        image=source,
+    ).update(image_variants=names)
+    return names
+
+
+def image_variants_done(recipe_id: int, source: str, future: Future) -> None:
+    """Сохранение результата обработки из пула процессов.
+    - Выполняется в служебном потоке пула,
+    соединения с базой данных потока закрываются.
+
+    Args:
+        - recipe_id (int): ID рецепта.
+        - source (str): Имя исходного изображения.
+        - future (Future): Результат `make_variants`.
+    """
+    try:
+        save_image_variants(recipe_id, source, future.result())
+    except Exception:
+        logger.exception('Изображение %s не обработано', source)
+    finally:
+        connections.close_all()
+
+
+def schedule_image_variants(recipe_id: int, source: str) -> None:
+    """Отправка изображения рецепта на обработку в пул процессов.
+    - Если то же изображение уже обработано для другого рецепта,
+    его варианты переиспользуются.
+    - Без процессов пула (`FOODGRAM_IMAGE_WORKERS = 0`)
+    изображение обрабатывается сразу.
+
+    Args:
+        - recipe_id (int): ID рецепта.
+        - source (str): Имя исходного изображения.
+    """
+    variants = Recipe.objects.filter(
+        image=source,
+        **{f'image_variants__{con.IMAGE_SOURCE_KEY}': source},
+    ).values_list('image_variants', flat=True).first()
+    if variants:
+        Recipe.objects.filter(
+            id=recipe_id,
+            image=source,
+        ).update(image_variants=variants)
+        return
+    path = content_hash_storage.path(source)
+    if not settings.FOODGRAM_IMAGE_WORKERS:
+        save_image_variants(recipe_id, source, make_variants(path))
+        return
+    get_executor().submit(make_variants, path).add_done_callback(
+        partial(image_variants_done, recipe_id, source)
+    )
+
+
+def image_variant_urls(
+    recipe: Recipe,
+    request: HttpRequest or None = None
+) -> dict or None:
+    """Ссылки на варианты изображения рецепта.
+
+    Args:
+        - recipe (Recipe): Рецепт.
+        - request (HttpRequest or None): Запрос для полных ссылок.
+
+    Returns:
+        - dict or None: Ссылки по вариантам и форматам
+        или ничего, если изображение еще не обработано.
+    """
+    variants = recipe.image_variants or {}
+    if not recipe.image or variants.get(
+        con.IMAGE_SOURCE_KEY
+    ) != recipe.image.name:
+        return None
+    urls: dict = {}
+    for variant in con.IMAGE_VARIANTS:
+        urls[variant] = {}
+        for format, name in variants.get(variant, {}).items():
+            url = default_storage.url(name)
+            if request is not None:
+                url = request.build_absolute_uri(url)
+            urls[variant][format] = url
+    return urls
@@ -0,0 +1,117 @@
+import os
+from datetime import timedelta
+from typing import Any, Iterator
+
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+from django.utils import timezone
+
+from recipes import constants as con
+from recipes.models import Recipe
+from recipes.storage import content_hash_storage
+
+
+def referenced_files() -> set[str]:
+    """Имена файлов, на которые ссылаются рецепты.
+    - Учитываются изображения рецептов и варианты
+    текущих изображений.
+
+    Returns:
+        - set[str]: Имена файлов в хранилище.
+    """
+    names: set[str] = set()
+    for image, variants in Recipe.objects.exclude(
+        image='',
+    ).values_list(
+        'image',
+        'image_variants',
+    ).iterator():
+        names.add(image)
+        variants = variants or {}
+        if variants.get(con.IMAGE_SOURCE_KEY) != image:
+            continue
+        for variant in con.IMAGE_VARIANTS:
+            names.update(variants.get(variant, {}).values())
+    return names
+
+
+def stored_files(directory: str) -> Iterator[str]:
+    """Имена всех файлов каталога хранилища.
+
+    Args:
+        - directory (str): Каталог в хранилище.
+
+    Yields:
+        - str: Имя файла в хранилище.
+    """
+    if not content_hash_storage.exists(directory):
+        return
+    directories, files = content_hash_storage.listdir(directory)
+    for file in files:
+        yield os.path.join(directory, file)
+    for child in directories:
+        yield from stored_files(os.path.join(directory, child))
+
+
+class Command(BaseCommand):
+    """Удаление неиспользуемых файлов изображений.
+    - Ссылки на файлы загружаются из базы данных одним проходом,
+    затем файлы каталогов изображений сравниваются с ними.
+    - Файлы новее `--min-age` секунд не удаляются,
+    они могут принадлежать незавершенной загрузке.
+
+    Examples:
+        >>> python manage.py foodgram_collect_media
+        >>> Сборка неиспользуемых файлов запущена
+        >>> Удалено 12 файлов, освобождено 8,4 МБ
+        >>> Сборка неиспользуемых файлов завершена
+    """
+    help = con.COMMAND_MEDIA_HELP
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать файлы без удаления.',
+        )
+        parser.add_argument(
+            '--min-age',
+            type=int,
+            default=con.IMAGE_ORPHAN_MIN_AGE,
+            help='Минимальный возраст удаляемого файла в секундах.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        self.stdout.write(
+            con.COMMAND_MEDIA_START,
+            self.style.SUCCESS
+        )
+        referenced = referenced_files()
+        border = timezone.now() - timedelta(seconds=options['min_age'])
+        removed = reclaimed = 0
+        for directory in (con.IMAGE_UPLOAD_DIR, con.IMAGE_VARIANTS_DIR):
+            for name in stored_files(directory):
+                if (
+                    name in referenced
+                    or content_hash_storage.get_modified_time(name) > border
+                ):
+                    continue
+                size = content_hash_storage.size(name)
+                if options['dry_run']:
+                    self.stdout.write(f'{name} {filesizeformat(size)}')
+                else:
+                    content_hash_storage.delete(name)
+                removed += 1
+                reclaimed += size
+        found, freed = (
+            ('Найдено', 'можно освободить') if options['dry_run']
+            else ('Удалено', 'освобождено')
+        )
+        self.stdout.write(
+            f'{found} {self.style.SUCCESS(removed)} файлов, '
+            f'{freed} {self.style.SUCCESS(filesizeformat(reclaimed))}'
+        )
+        self.stdout.write(
+            con.COMMAND_MEDIA_END,
+            self.style.SUCCESS
+        )
@@ -0,0 +1,74 @@
+from itertools import islice
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from recipes import constants as con
+from recipes.images import get_executor, save_image_variants
+from recipes.models import Recipe
+from recipes.thumbnails import make_variants
+
+
+class Command(BaseCommand):
+    """Создание уменьшенных копий изображений рецептов.
+    - По умолчанию обрабатываются только изображения без копий.
+    - Изображения обрабатываются пакетами в пуле процессов.
+
+    Examples:
+        >>> python manage.py foodgram_image_variants
+        >>> Обработка изображений запущена
+        >>> Обработано 120 изображений
+        >>> Обработка изображений завершена
+    """
+    help = con.COMMAND_IMAGES_HELP
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Пересоздать копии всех изображений.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=con.IMAGE_BATCH_SIZE,
+            help='Количество изображений в одном пакете.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        self.stdout.write(
+            con.COMMAND_IMAGES_START,
+            self.style.SUCCESS
+        )
+        recipes = (
+            recipe for recipe in Recipe.objects.exclude(
+                image='',
+            ).only(
+                'id',
+                'image',
+                'image_variants',
+            ).iterator()
+            if options['all'] or (recipe.image_variants or {}).get(
+                con.IMAGE_SOURCE_KEY
+            ) != recipe.image.name
+        )
+        mapper = (
+            get_executor().map if settings.FOODGRAM_IMAGE_WORKERS else map
+        )
+        processed = 0
+        while batch := list(islice(recipes, options['batch_size'])):
+            results = mapper(
+                make_variants,
+                [recipe.image.path for recipe in batch],
+            )
+            for recipe, variants in zip(batch, results):
+                save_image_variants(recipe.id, recipe.image.name, variants)
+            processed += len(batch)
+        self.stdout.write(
+            f'Обработано {self.style.SUCCESS(processed)} изображений'
+        )
+        self.stdout.write(
+            con.COMMAND_IMAGES_END,
+            self.style.SUCCESS
+        )
@@ -6,6 +6,7 @@ from django.core.management.base import BaseCommand
 
 from recipes import constants as con
 from recipes.models import Ingredient, Tag
+from recipes.search import bump_ingredient_version
 
 MODEL_PATH: tuple[tuple[Any, str]] = (
     (Ingredient, 'data/ingredients.csv'),
@@ -66,6 +67,7 @@ class Command(BaseCommand):
                     'объектов'
                 )
             csv_file.close()
+        bump_ingredient_version()
         self.stdout.write(
             con.COMMAND_END,
             self.style.SUCCESS
@@ -0,0 +1,57 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from recipes import constants as con
+from recipes.models import RecipeIngredientAmount, ShoppingCartIngredient
+from recipes.shopping_cart import bump_shopping_cart_version
+from recipes.tools import fill_shopping_carts
+
+
+class Command(BaseCommand):
+    """Пересборка суммарных ингредиентов списков покупок.
+
+    Examples:
+        >>> python manage.py foodgram_rebuild_carts
+        >>> Пересборка списков покупок запущена
+        >>> Сохранено 120 ингредиентов списков покупок
+        >>> Пересборка списков покупок завершена
+    """
+    help = con.COMMAND_CARTS_HELP
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            '--user',
+            type=int,
+            nargs='*',
+            help='ID пользователей, по умолчанию все пользователи.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество объектов в одном запросе создания.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        self.stdout.write(
+            con.COMMAND_CARTS_START,
+            self.style.SUCCESS
+        )
+        with transaction.atomic():
+            created = fill_shopping_carts(
+                ShoppingCartIngredient,
+                RecipeIngredientAmount,
+                options['user'],
+                options['batch_size'],
+            )
+            transaction.on_commit(bump_shopping_cart_version)
+        self.stdout.write(
+            f'Сохранено {self.style.SUCCESS(created)} '
+            'ингредиентов списков покупок'
+        )
+        self.stdout.write(
+            con.COMMAND_CARTS_END,
+            self.style.SUCCESS
+        )
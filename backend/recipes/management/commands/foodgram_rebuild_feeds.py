@@ -0,0 +1,59 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from recipes import constants as con
+from recipes.feed import update_feed_modes
+from recipes.models import FeedRecipe, Recipe
+from recipes.tools import fill_feeds
+
+
+class Command(BaseCommand):
+    """Пересборка лент рецептов подписок.
+    - Нужна после изменения `FEED_FANOUT_MAX_FOLLOWERS`
+    или `FEED_FANOUT_MIN_FOLLOWERS`: авторы переключаются по порогам.
+
+    Examples:
+        >>> python manage.py foodgram_rebuild_feeds
+        >>> Пересборка лент подписок запущена
+        >>> Сохранено 2400 рецептов лент подписок
+        >>> Пересборка лент подписок завершена
+    """
+    help = con.COMMAND_FEEDS_HELP
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            '--user',
+            type=int,
+            nargs='*',
+            help='ID пользователей, по умолчанию все пользователи.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=con.FEED_BATCH_SIZE,
+            help='Количество объектов в одном запросе создания.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        self.stdout.write(
+            con.COMMAND_FEEDS_START,
+            self.style.SUCCESS
+        )
+        with transaction.atomic():
+            update_feed_modes()
+            created = fill_feeds(
+                FeedRecipe,
+                Recipe,
+                options['user'],
+                options['batch_size'],
+            )
+        self.stdout.write(
+            f'Сохранено {self.style.SUCCESS(created)} '
+            'рецептов лент подписок'
+        )
+        self.stdout.write(
+            con.COMMAND_FEEDS_END,
+            self.style.SUCCESS
+        )
@@ -0,0 +1,71 @@
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+
+from recipes import constants as con
+from recipes.models import FavoriteRecipes, Recipe
+from recipes.tools import count_subquery
+from users.models import Follow
+
+User = get_user_model()
+
+COUNTERS: tuple[tuple[Any, str, Any, str]] = (
+    (Recipe, 'favorite_count', FavoriteRecipes, 'recipe'),
+    (User, 'recipes_count', Recipe, 'author'),
+    (User, 'followers_count', Follow, 'following'),
+)
+
+
+class Command(BaseCommand):
+    """Пересчет счетчиков избранного, рецептов и подписчиков.
+    - Обновляются только разошедшиеся счетчики.
+
+    Examples:
+        >>> python manage.py foodgram_recount
+        >>> Пересчет счетчиков запущен
+        >>> Счетчик favorite_count модели Рецепты исправлен у 0 объектов
+        >>> Пересчет счетчиков завершен
+    """
+    help = con.COMMAND_RECOUNT_HELP
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество объектов в одном запросе обновления.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        self.stdout.write(
+            con.COMMAND_RECOUNT_START,
+            self.style.SUCCESS
+        )
+        batch_size = options['batch_size']
+        for model, field, related, related_field in COUNTERS:
+            with transaction.atomic():
+                drifted = list(
+                    model.objects.select_for_update()
+                    .annotate(actual=count_subquery(related, related_field))
+                    .exclude(**{field: F('actual')})
+                    .only('id', field)
+                )
+                for obj in drifted:
+                    setattr(obj, field, obj.actual)
+                model.objects.bulk_update(
+                    drifted,
+                    [field],
+                    batch_size=batch_size
+                )
+            self.stdout.write(
+                f'Счетчик {field} модели '
+                f'{self.style.SUCCESS(model._meta.verbose_name_plural)} '
+                f'исправлен у {self.style.SUCCESS(len(drifted))} объектов'
+            )
+        self.stdout.write(
+            con.COMMAND_RECOUNT_END,
+            self.style.SUCCESS
+        )
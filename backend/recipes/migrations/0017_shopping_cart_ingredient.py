@@ -0,0 +1,69 @@
+# Generated by Django 3.2.16 on 2026-10-18 18:21
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+import django.db.models.deletion
+
+
+def fill_carts(apps, schema_editor):
+    ShoppingCartIngredient = apps.get_model(
+        'recipes', 'ShoppingCartIngredient'
+    )
+    RecipeIngredientAmount = apps.get_model(
+        'recipes', 'RecipeIngredientAmount'
+    )
+    totals = RecipeIngredientAmount.objects.filter(
+        recipe__shop_recipe__isnull=False
+    ).values(
+        'recipe__shop_recipe__user',
+        'ingredient',
+    ).annotate(
+        total=Sum('amount')
+    ).order_by().values_list(
+        'recipe__shop_recipe__user',
+        'ingredient',
+        'total',
+    )
+    ShoppingCartIngredient.objects.all().delete()
+    ShoppingCartIngredient.objects.bulk_create(
+        ShoppingCartIngredient(
+            user_id=user,
+            ingredient_id=ingredient,
+            amount=total,
+        )
+        for user, ingredient, total in totals
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('recipes', '0016_ingredient_name_trigram'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShoppingCartIngredient',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.PositiveIntegerField(default=0, verbose_name='Количество')),
+                ('ingredient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cart_ingredient', to='recipes.ingredient', verbose_name='Ингредиенты')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cart_user', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'Ингредиент списка покупок',
+                'verbose_name_plural': 'Ингредиенты списков покупок',
+                'ordering': ('user', 'id'),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='shoppingcartingredient',
+            constraint=models.UniqueConstraint(fields=('user', 'ingredient'), name='unique_shopping_cart_ingredient'),
+        ),
+        migrations.RunPython(
+            fill_carts,
+            migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 3.2.16 on 2026-10-18 18:38
+
+from django.db import migrations, models
+import recipes.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0018_recipe_image_variants'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='recipe',
+            name='image',
+            field=models.ImageField(help_text='Изображение рецепта.', storage=recipes.storage.ContentHashStorage(), upload_to='recipe/images/', verbose_name='Изображение'),
+        ),
+    ]
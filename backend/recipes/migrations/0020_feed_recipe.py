@@ -0,0 +1,78 @@
+# Generated by Django 3.2.16 on 2026-10-18 18:45
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+FEED_FANOUT_MAX_FOLLOWERS = 1000
+FEED_BATCH_SIZE = 1000
+
+
+def fill_feed_recipes(apps, schema_editor):
+    FeedRecipe = apps.get_model('recipes', 'FeedRecipe')
+    Recipe = apps.get_model('recipes', 'Recipe')
+    recipes = Recipe.objects.filter(
+        author__follow_following__isnull=False,
+        author__followers_count__lte=FEED_FANOUT_MAX_FOLLOWERS,
+    ).order_by().values_list(
+        'author__follow_following__user',
+        'author',
+        'id',
+        'pub_data',
+    )
+    FeedRecipe.objects.all().delete()
+    FeedRecipe.objects.bulk_create(
+        (
+            FeedRecipe(
+                user_id=user,
+                author_id=author,
+                recipe_id=recipe,
+                pub_data=pub_data,
+            )
+            for user, author, recipe, pub_data in recipes.iterator()
+        ),
+        batch_size=FEED_BATCH_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('recipes', '0019_recipe_image_content_hash_storage'),
+        ('users', '0007_user_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedRecipe',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pub_data', models.DateTimeField(help_text='Дата публикации рецепта.', verbose_name='Дата публикации')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_author', to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+                ('recipe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to='recipes.recipe', verbose_name='Рецепт')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_user', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'Рецепт ленты',
+                'verbose_name_plural': 'Рецепты лент',
+                'ordering': ('user', '-pub_data'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='feedrecipe',
+            index=models.Index(fields=['user', '-pub_data', '-recipe'], name='feed_user_pub_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedrecipe',
+            index=models.Index(fields=['user', 'author'], name='feed_user_author_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='feedrecipe',
+            constraint=models.UniqueConstraint(fields=('user', 'recipe'), name='unique_feed_recipe'),
+        ),
+        migrations.RunPython(
+            fill_feed_recipes,
+            migrations.RunPython.noop,
+        ),
+    ]
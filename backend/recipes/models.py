@@ -4,6 +4,7 @@ from django.db import models
 from django.db.models import UniqueConstraint
 
 from . import constants as con
+from .storage import content_hash_storage
 from .tools import minutes_to_hours
 
 
@@ -96,7 +97,8 @@ class Recipe(NameModel):
     )
     image = models.ImageField(
         con.MODEL_NAME_IMAGE,
-        upload_to='recipe/images/',
+        upload_to=con.IMAGE_UPLOAD_DIR,
+        storage=content_hash_storage,
         help_text='Изображение рецепта.',
     )
     text = models.TextField(
@@ -133,6 +135,19 @@ class Recipe(NameModel):
         auto_now_add=True,
         help_text='Добавляется автоматически.',
     )
+    favorite_count = models.PositiveIntegerField(
+        con.MODEL_NAME_FAVORITE_COUNT,
+        default=0,
+        editable=False,
+        help_text='Обновляется автоматически.',
+    )
+    image_variants = models.JSONField(
+        con.MODEL_NAME_IMAGE_VARIANTS,
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text='Уменьшенные копии изображения, создаются автоматически.',
+    )
 
     class Meta:
         verbose_name: str = 'Рецепт'
@@ -143,6 +158,12 @@ class Recipe(NameModel):
             'id',
             'author',
         )
+        indexes = [
+            models.Index(
+                fields=['-pub_data', '-id'],
+                name='recipe_pub_data_id_idx',
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.name
@@ -268,3 +289,104 @@ class ShoppingList(models.Model):
 
     def __str__(self) -> str:
         return f'{self.user.username} {self.recipe.name}'
+
+
+class ShoppingCartIngredient(models.Model):
+    """Модель суммарного количества ингредиента в списке покупок.
+    - Обновляется изменениями при добавлении и удалении рецептов
+    из списка покупок и при изменении ингредиентов рецепта.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='cart_user',
+        verbose_name=con.MODEL_NAME_USER,
+    )
+    ingredient = models.ForeignKey(
+        Ingredient,
+        on_delete=models.CASCADE,
+        related_name='cart_ingredient',
+        verbose_name=con.MODEL_NAME_INGREDIENTS,
+    )
+    amount = models.PositiveIntegerField(
+        con.MODEL_NAME_AMOUNT,
+        default=0,
+    )
+
+    class Meta:
+        verbose_name: str = 'Ингредиент списка покупок'
+        verbose_name_plural: str = 'Ингредиенты списков покупок'
+        constraints = [
+            UniqueConstraint(
+                fields=['user', 'ingredient'],
+                name='unique_shopping_cart_ingredient'
+            )
+        ]
+        ordering = (
+            'user',
+            'id',
+        )
+
+    def __str__(self) -> str:
+        return (
+            f'{self.user.username} {self.ingredient.name} '
+            f'{self.amount} {self.ingredient.measurement_unit}'
+        )
+
+
+class FeedRecipe(models.Model):
+    """Модель ленты рецептов подписок пользователя.
+    - Заполняется при создании рецепта для подписчиков автора
+    и при подписке на автора, очищается при отписке.
+    - Рецепты авторов с большим числом подписчиков в ленту
+    не записываются и читаются напрямую.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='feed_user',
+        verbose_name=con.MODEL_NAME_USER,
+    )
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='feed_author',
+        verbose_name=con.MODEL_NAME_AUTHOR,
+    )
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name='feed_entries',
+        verbose_name=con.MODEL_NAME_RECIPE,
+    )
+    pub_data = models.DateTimeField(
+        con.MODEL_NAME_PUB_DATA,
+        help_text='Дата публикации рецепта.',
+    )
+
+    class Meta:
+        verbose_name: str = 'Рецепт ленты'
+        verbose_name_plural: str = 'Рецепты лент'
+        constraints = [
+            UniqueConstraint(
+                fields=['user', 'recipe'],
+                name='unique_feed_recipe'
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=['user', '-pub_data', '-recipe'],
+                name='feed_user_pub_data_idx',
+            ),
+            models.Index(
+                fields=['user', 'author'],
+                name='feed_user_author_idx',
+            ),
+        ]
+        ordering = (
+            'user',
+            '-pub_data',
+        )
+
+    def __str__(self) -> str:
+        return f'{self.user.username} {self.recipe.name}'
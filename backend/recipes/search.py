@@ -0,0 +1,303 @@
+import heapq
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from typing import NamedTuple
+from uuid import uuid4
+
+from django.contrib.postgres.search import TrigramSimilarity
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Case, FloatField, Q, Value, When
+
+from . import constants as con
+from .models import Ingredient
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def trigrams(text: str) -> set[str]:
+    """Триграммы строки как в расширении `pg_trgm`.
+    - Каждое слово дополняется двумя пробелами в начале и одним в конце.
+
+    Args:
+        - text (str): Строка.
+
+    Returns:
+        - set[str]: Триграммы строки без учета регистра.
+    """
+    grams: set[str] = set()
+    for word in WORD_PATTERN.findall(text.casefold()):
+        word = f'  {word} '
+        grams.update(word[index:index + 3] for index in range(len(word) - 2))
+    return grams
+
+
+def bump_ingredient_version() -> None:
+    """Смена версии каталога ингредиентов.
+    - Индексы всех процессов перестроятся при следующем поиске.
+    """
+    cache.set(con.SEARCH_VERSION_KEY, uuid4().hex, None)
+
+
+def substrings(text: str) -> set[str]:
+    """Подстроки строки длиной до `SEARCH_SUBSTRING_SIZE` символов.
+
+    Args:
+        - text (str): Строка.
+
+    Returns:
+        - set[str]: Подстроки строки.
+    """
+    return {
+        text[index:index + size]
+        for size in range(1, con.SEARCH_SUBSTRING_SIZE + 1)
+        for index in range(len(text) - size + 1)
+    }
+
+
+class IndexSnapshot(NamedTuple):
+    """Неизменяемый снимок индекса ингредиентов.
+
+    Attributes:
+        - version (str or None): Версия каталога.
+        - keys (tuple[str]): Названия без учета регистра по порядку.
+        - ingredients (tuple[Ingredient]): Ингредиенты по порядку.
+        - grams (dict[str, tuple[int]] or None): Позиции названий
+        по триграммам или ничего до первого нечеткого поиска.
+        - sizes (tuple[int]): Количество триграмм названий.
+        - substrings (dict[str, tuple[int]] or None): Позиции названий
+        по коротким подстрокам.
+    """
+    version: str or None
+    keys: tuple[str, ...]
+    ingredients: tuple[Ingredient, ...]
+    grams: dict[str, tuple[int, ...]] or None = None
+    sizes: tuple[int, ...] = ()
+    substrings: dict[str, tuple[int, ...]] or None = None
+
+
+class IngredientIndex:
+    """Отсортированный индекс ингредиентов в памяти процесса.
+    - Поиск по началу названия выполняется бинарным поиском.
+    - Индекс перестраивается при смене версии каталога.
+    - Поиск читает только неизменяемый снимок индекса,
+    новый снимок заменяет старый одним присваиванием под блокировкой.
+    """
+    def __init__(self) -> None:
+        self.snapshot = IndexSnapshot(None, (), ())
+        self.lock = threading.Lock()
+
+    def ensure(self) -> IndexSnapshot:
+        """Перестроение индекса если версия каталога изменилась.
+
+        Returns:
+            - IndexSnapshot: Снимок индекса текущей версии.
+        """
+        version = cache.get(con.SEARCH_VERSION_KEY)
+        if version is None:
+            version = uuid4().hex
+            cache.add(con.SEARCH_VERSION_KEY, version, None)
+            version = cache.get(con.SEARCH_VERSION_KEY, version)
+        snapshot = self.snapshot
+        if version == snapshot.version:
+            return snapshot
+        with self.lock:
+            if version != self.snapshot.version:
+                self.snapshot = self.rebuild(version)
+            return self.snapshot
+
+    def rebuild(self, version: str) -> IndexSnapshot:
+        """Загрузка каталога ингредиентов одним запросом.
+
+        Args:
+            - version (str): Версия каталога.
+
+        Returns:
+            - IndexSnapshot: Снимок индекса без триграмм.
+        """
+        ingredients = sorted(
+            Ingredient.objects.order_by(),
+            key=lambda ingredient: (ingredient.name.casefold(), ingredient.id)
+        )
+        return IndexSnapshot(
+            version,
+            tuple(ingredient.name.casefold() for ingredient in ingredients),
+            tuple(ingredients),
+        )
+
+    def build_grams(self, snapshot: IndexSnapshot) -> IndexSnapshot:
+        """Построение обратных индексов для нечеткого поиска.
+        - Индексы строятся один раз для снимка,
+        снимок заменяется, если каталог не изменился.
+
+        Args:
+            - snapshot (IndexSnapshot): Снимок индекса.
+
+        Returns:
+            - IndexSnapshot: Снимок индекса с триграммами и подстроками.
+        """
+        if snapshot.grams is not None:
+            return snapshot
+        with self.lock:
+            current = self.snapshot
+            if (
+                current.version == snapshot.version
+                and current.grams is not None
+            ):
+                return current
+            grams: dict[str, list[int]] = defaultdict(list)
+            parts: dict[str, list[int]] = defaultdict(list)
+            sizes: list[int] = []
+            for position, key in enumerate(snapshot.keys):
+                key_grams = trigrams(key)
+                sizes.append(len(key_grams))
+                for gram in key_grams:
+                    grams[gram].append(position)
+                for part in substrings(key):
+                    parts[part].append(position)
+            snapshot = snapshot._replace(
+                grams={gram: tuple(items) for gram, items in grams.items()},
+                sizes=tuple(sizes),
+                substrings={
+                    part: tuple(items) for part, items in parts.items()
+                },
+            )
+            if current.version == snapshot.version:
+                self.snapshot = snapshot
+            return snapshot
+
+    def search(
+        self,
+        prefix: str = '',
+        limit: int or None = None
+    ) -> list[Ingredient]:
+        """Поиск ингредиентов по началу названия.
+
+        Args:
+            - prefix (str): Начало названия без учета регистра.
+            - limit (int or None): Максимальное количество ингредиентов.
+
+        Returns:
+            - list[Ingredient]: Ингредиенты отсортированные по названию.
+        """
+        snapshot = self.ensure()
+        keys = snapshot.keys
+        prefix = prefix.casefold()
+        start = bisect_left(keys, prefix)
+        end = bisect_right(keys, prefix + con.SEARCH_MAX_CHAR, lo=start)
+        if limit is not None:
+            end = min(end, start + limit)
+        return list(snapshot.ingredients[start:end])
+
+    def ranked(self, query: str, limit: int) -> list[Ingredient]:
+        """Нечеткий поиск с ранжированием по индексу триграмм.
+        - Совпадение начала названия выше вхождения подстроки,
+        вхождение подстроки выше похожести по триграммам.
+        - Совпадения начала названия берутся из диапазона
+        бинарного поиска, вхождения подстроки из пересечения
+        позиций коротких подстрок запроса.
+
+        Args:
+            - query (str): Поисковая строка.
+            - limit (int): Максимальное количество ингредиентов.
+
+        Returns:
+            - list[Ingredient]: Ингредиенты по убыванию ранга.
+        """
+        snapshot = self.build_grams(self.ensure())
+        keys, sizes = snapshot.keys, snapshot.sizes
+        query = query.casefold()
+        query_grams = trigrams(query)
+        shared: Counter = Counter()
+        for gram in query_grams:
+            shared.update(snapshot.grams.get(gram, ()))
+        scores: dict[int, float] = {}
+        for position, count in shared.items():
+            similarity = count / (
+                len(query_grams) + sizes[position] - count
+            )
+            if similarity >= con.SEARCH_SIMILARITY_THRESHOLD:
+                scores[position] = similarity
+        start = bisect_left(keys, query)
+        end = bisect_right(keys, query + con.SEARCH_MAX_CHAR, lo=start)
+        for position in range(start, end):
+            scores[position] = (
+                scores.get(position, 0) + con.SEARCH_RANK_PREFIX
+            )
+        for position in self.containing(snapshot, query):
+            if not start <= position < end:
+                scores[position] = (
+                    scores.get(position, 0) + con.SEARCH_RANK_SUBSTRING
+                )
+        best = heapq.nsmallest(
+            limit,
+            scores.items(),
+            key=lambda item: (-item[1], keys[item[0]], item[0])
+        )
+        return [snapshot.ingredients[position] for position, _ in best]
+
+    def containing(self, snapshot: IndexSnapshot, query: str) -> set[int]:
+        """Позиции названий, содержащих строку.
+        - Кандидаты - пересечение позиций подстрок строки
+        длиной `SEARCH_SUBSTRING_SIZE`, начиная с самой редкой.
+
+        Args:
+            - snapshot (IndexSnapshot): Снимок индекса с подстроками.
+            - query (str): Строка без учета регистра.
+
+        Returns:
+            - set[int]: Позиции названий.
+        """
+        if not query:
+            return set()
+        size = min(len(query), con.SEARCH_SUBSTRING_SIZE)
+        postings = sorted(
+            (
+                snapshot.substrings.get(query[index:index + size], ())
+                for index in range(len(query) - size + 1)
+            ),
+            key=len,
+        )
+        candidates = set(postings[0])
+        for positions in postings[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(positions)
+        if len(query) <= con.SEARCH_SUBSTRING_SIZE:
+            return candidates
+        return {
+            position for position in candidates
+            if query in snapshot.keys[position]
+        }
+
+
+ingredient_index = IngredientIndex()
+
+
+def ranked_search(query: str, limit: int) -> list[Ingredient]:
+    """Нечеткий поиск ингредиентов с ранжированием.
+    - В `PostgreSQL` используется `pg_trgm` и индекс `GIN` по названию.
+    - В остальных базах данных используется индекс триграмм в памяти.
+
+    Args:
+        - query (str): Поисковая строка.
+        - limit (int): Максимальное количество ингредиентов.
+
+    Returns:
+        - list[Ingredient]: Ингредиенты по убыванию ранга.
+    """
+    if connection.vendor != 'postgresql':
+        return ingredient_index.ranked(query, limit)
+    rank = Case(
+        When(name__istartswith=query, then=Value(con.SEARCH_RANK_PREFIX)),
+        When(name__icontains=query, then=Value(con.SEARCH_RANK_SUBSTRING)),
+        default=Value(0),
+        output_field=FloatField(),
+    ) + TrigramSimilarity('name', query)
+    return list(
+        Ingredient.objects.filter(
+            Q(name__icontains=query) | Q(name__trigram_similar=query)
+        ).annotate(rank=rank).order_by('-rank', 'name', 'id')[:limit]
+    )
@@ -0,0 +1,246 @@
+from collections.abc import Iterable, Iterator
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.functions import Greatest
+from django.db.models.query import QuerySet
+
+from . import constants as con
+from .models import (RecipeIngredientAmount, ShoppingCartIngredient,
+                     ShoppingList,)
+from .tools import fill_shopping_carts
+from .units import merge_units
+
+
+def user_version_key(user_id: int) -> str:
+    """Ключ версии списка покупок пользователя.
+
+    Args:
+        - user_id (int): ID пользователя.
+
+    Returns:
+        - str: Ключ кеша.
+    """
+    return f'{con.SHOPPING_CART_VERSION_KEY}_{user_id}'
+
+
+def bump_shopping_cart_version(user_id: int or None = None) -> None:
+    """Смена версии списка покупок.
+    - С пользователем меняется версия его списка покупок.
+    - Без пользователя меняется общая версия ингредиентов рецептов,
+    сохраненные списки покупок всех пользователей устаревают.
+
+    Args:
+        - user_id (int or None): ID пользователя.
+    """
+    key = con.SHOPPING_CART_VERSION_KEY
+    if user_id is not None:
+        key = user_version_key(user_id)
+    cache.set(key, uuid4().hex, None)
+
+
+def shopping_cart_cache_key(user_id: int, format: str) -> str:
+    """Ключ кеша файла списка покупок для текущей версии.
+
+    Args:
+        - user_id (int): ID пользователя.
+        - format (str): Формат файла.
+
+    Returns:
+        - str: Ключ кеша.
+    """
+    keys = (con.SHOPPING_CART_VERSION_KEY, user_version_key(user_id))
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, uuid4().hex, None)
+            versions[key] = cache.get(key)
+    return '_'.join((
+        con.SHOPPING_CART_CACHE_KEY,
+        str(user_id),
+        format,
+        *(versions[key] for key in keys),
+    ))
+
+
+def shopping_cart_rows(
+    user_id: int
+) -> Iterator[tuple[str, str, int or float]]:
+    """Суммарное количество ингредиентов списка покупок.
+    - Суммы читаются из `ShoppingCartIngredient` по индексу пользователя.
+    - Строки читаются частями через серверный курсор.
+    - Совместимые единицы одного ингредиента объединяются.
+
+    Args:
+        - user_id (int): ID пользователя.
+
+    Returns:
+        - Iterator[tuple[str, str, int or float]]: Название,
+        единица измерения и количество ингредиента.
+    """
+    rows = ShoppingCartIngredient.objects.filter(
+        user=user_id
+    ).order_by(
+        'ingredient__name',
+        'ingredient__measurement_unit',
+    ).values_list(
+        'ingredient__name',
+        'ingredient__measurement_unit',
+        'amount',
+    ).iterator(chunk_size=con.SHOPPING_CART_CHUNK_SIZE)
+    return merge_units(rows)
+
+
+def recipe_amounts(recipe_id: int) -> dict[int, int]:
+    """Количество ингредиентов рецепта.
+
+    Args:
+        - recipe_id (int): ID рецепта.
+
+    Returns:
+        - dict[int, int]: Количество по ID ингредиента.
+    """
+    return dict(
+        RecipeIngredientAmount.objects.filter(
+            recipe=recipe_id
+        ).order_by().values_list('ingredient', 'amount')
+    )
+
+
+def change_shopping_carts(
+    users: QuerySet or list[int],
+    deltas: dict[int, int]
+) -> None:
+    """Изменение суммарных ингредиентов списков покупок.
+    - Недостающие строки создаются одним запросом,
+    все изменения применяются одним `UPDATE`,
+    обнуленные строки удаляются.
+
+    Args:
+        - users (QuerySet or list[int]): ID пользователей.
+        - deltas (dict[int, int]): Изменение количества
+        по ID ингредиента.
+    """
+    deltas = {ingredient: delta for ingredient, delta in deltas.items()
+              if delta}
+    if not deltas:
+        return
+    added = [ingredient for ingredient, delta in deltas.items() if delta > 0]
+    if added:
+        ShoppingCartIngredient.objects.bulk_create(
+            (
+                ShoppingCartIngredient(user_id=user, ingredient_id=ingredient)
+                for user in users
+                for ingredient in added
+            ),
+            batch_size=con.SHOPPING_CART_CHUNK_SIZE,
+            ignore_conflicts=True,
+        )
+    carts = ShoppingCartIngredient.objects.filter(
+        user__in=users,
+        ingredient__in=deltas,
+    )
+    carts.update(
+        amount=Greatest(
+            F('amount') + Case(
+                *(
+                    When(ingredient=ingredient, then=Value(delta))
+                    for ingredient, delta in deltas.items()
+                ),
+                default=Value(0),
+                output_field=IntegerField(),
+            ),
+            0,
+        )
+    )
+    if len(added) < len(deltas):
+        carts.filter(amount=0).delete()
+
+
+def change_shopping_cart(user_id: int, recipe_id: int, sign: int) -> None:
+    """Добавление или удаление рецепта в суммах списка покупок.
+    - Версия списка покупок меняется после фиксации транзакции.
+
+    Args:
+        - user_id (int): ID пользователя.
+        - recipe_id (int): ID рецепта.
+        - sign (int): `1` при добавлении, `-1` при удалении рецепта.
+    """
+    change_shopping_carts(
+        [user_id],
+        {
+            ingredient: sign * amount
+            for ingredient, amount in recipe_amounts(recipe_id).items()
+        },
+    )
+    transaction.on_commit(lambda: bump_shopping_cart_version(user_id))
+
+
+def change_recipe_in_shopping_carts(
+    recipe_id: int,
+    old: dict[int, int],
+    new: dict[int, int]
+) -> None:
+    """Изменение сумм списков покупок с рецептом
+    после изменения его ингредиентов.
+
+    Args:
+        - recipe_id (int): ID рецепта.
+        - old (dict[int, int]): Прежнее количество по ID ингредиента.
+        - new (dict[int, int]): Новое количество по ID ингредиента.
+    """
+    deltas = {
+        ingredient: new.get(ingredient, 0) - old.get(ingredient, 0)
+        for ingredient in old.keys() | new.keys()
+    }
+    if not any(deltas.values()):
+        return
+    users = list(
+        ShoppingList.objects.filter(
+            recipe=recipe_id
+        ).order_by().values_list('user', flat=True)
+    )
+    if users:
+        change_shopping_carts(users, deltas)
+
+
+def rebuild_shopping_cart(user_id: int) -> None:
+    """Пересборка сумм списка покупок пользователя.
+    - Версия списка покупок меняется после фиксации транзакции.
+
+    Args:
+        - user_id (int): ID пользователя.
+    """
+    fill_shopping_carts(
+        ShoppingCartIngredient,
+        RecipeIngredientAmount,
+        [user_id],
+    )
+    transaction.on_commit(lambda: bump_shopping_cart_version(user_id))
+
+
+def cached_chunks(key: str, chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Отдача частей файла с сохранением файла в кеш.
+    - Файл сохраняется только если отдан полностью
+    и не превышает `SHOPPING_CART_CACHE_MAX_SIZE`.
+
+    Args:
+        - key (str): Ключ кеша.
+        - chunks (Iterable[bytes]): Части файла.
+
+    Returns:
+        - Iterator[bytes]: Части файла.
+    """
+    parts: list[bytes] or None = []
+    size = 0
+    for chunk in chunks:
+        if parts is not None:
+            size += len(chunk)
+            parts.append(chunk)
+            if size > con.SHOPPING_CART_CACHE_MAX_SIZE:
+                parts = None
+        yield chunk
+    if parts is not None:
+        cache.set(key, b''.join(parts), con.SHOPPING_CART_CACHE_TIMEOUT)
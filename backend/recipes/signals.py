@@ -0,0 +1,133 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .constants import IMAGE_SOURCE_KEY
+from .feed import fan_out_recipes
+from .images import schedule_image_variants
+from .models import Ingredient, Recipe
+from .search import bump_ingredient_version
+from .shopping_cart import (bump_shopping_cart_version,
+                            change_recipe_in_shopping_carts,)
+from .tools import change_counter
+
+User = get_user_model()
+
+
+@receiver(pre_delete, sender=User)
+def user_deleting(
+    sender: type[User],
+    instance: User,
+    **kwargs
+) -> None:
+    """Уменьшение счетчика избранного у рецептов
+    из избранного удаляемого пользователя.
+    """
+    change_counter(
+        Recipe.objects.filter(favorite_recipe__user=instance),
+        'favorite_count',
+        -1
+    )
+
+
+@receiver(post_save, sender=Recipe)
+def recipe_created(
+    sender: type[Recipe],
+    instance: Recipe,
+    created: bool,
+    raw: bool = False,
+    **kwargs
+) -> None:
+    """Увеличение счетчика рецептов у автора
+    и запись рецепта в ленты подписчиков.
+    """
+    if created and not raw:
+        change_counter(
+            User.objects.filter(id=instance.author_id),
+            'recipes_count',
+            1
+        )
+        fan_out_recipes((instance,))
+
+
+@receiver(post_delete, sender=Recipe)
+def recipe_deleted(
+    sender: type[Recipe],
+    instance: Recipe,
+    **kwargs
+) -> None:
+    """Уменьшение счетчика рецептов у автора."""
+    change_counter(
+        User.objects.filter(id=instance.author_id),
+        'recipes_count',
+        -1
+    )
+
+
+@receiver(post_save, sender=Ingredient)
+@receiver(post_delete, sender=Ingredient)
+def ingredient_changed(
+    sender: type[Ingredient],
+    instance: Ingredient,
+    **kwargs
+) -> None:
+    """Смена версии каталога ингредиентов после фиксации транзакции."""
+    transaction.on_commit(bump_ingredient_version)
+    transaction.on_commit(bump_shopping_cart_version)
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_delete, sender=Recipe)
+def recipe_changed(
+    sender: type[Recipe],
+    instance: Recipe,
+    created: bool = False,
+    raw: bool = False,
+    **kwargs
+) -> None:
+    """Смена общей версии списков покупок после изменения
+    или удаления рецепта и фиксации транзакции.
+    """
+    if not created and not raw:
+        transaction.on_commit(bump_shopping_cart_version)
+
+
+@receiver(post_save, sender=Recipe)
+def recipe_image_saved(
+    sender: type[Recipe],
+    instance: Recipe,
+    raw: bool = False,
+    **kwargs
+) -> None:
+    """Обработка нового изображения рецепта после фиксации транзакции."""
+    variants = instance.image_variants or {}
+    if (
+        not raw
+        and instance.image
+        and variants.get(IMAGE_SOURCE_KEY) != instance.image.name
+    ):
+        transaction.on_commit(
+            partial(schedule_image_variants, instance.id, instance.image.name)
+        )
+
+
+@receiver(pre_delete, sender=Recipe)
+def recipe_deleting(
+    sender: type[Recipe],
+    instance: Recipe,
+    **kwargs
+) -> None:
+    """Удаление ингредиентов рецепта из сумм списков покупок.
+    - Используются загруженные заранее ингредиенты рецепта.
+    """
+    change_recipe_in_shopping_carts(
+        instance.id,
+        {
+            amount.ingredient_id: amount.amount
+            for amount in instance.amount_recipe.all()
+        },
+        {}
+    )
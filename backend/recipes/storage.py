@@ -0,0 +1,31 @@
+import hashlib
+import os
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+
+class ContentHashStorage(FileSystemStorage):
+    """Хранилище файлов с именами по хешу содержимого.
+    - Имя файла `sha256` содержимого с расширением исходного имени,
+    одинаковые файлы сохраняются один раз.
+    - При повторной загрузке время изменения файла обновляется,
+    чтобы сборка неиспользуемых файлов не удалила его.
+    """
+    def _save(self, name: str, content: File) -> str:
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        directory, basename = os.path.split(name)
+        name = os.path.join(
+            directory,
+            digest.hexdigest() + os.path.splitext(basename)[1].lower(),
+        )
+        if self.exists(name):
+            os.utime(self.path(name))
+            return name
+        return super()._save(name, content)
+
+
+content_hash_storage = ContentHashStorage()
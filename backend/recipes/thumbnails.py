@@ -0,0 +1,71 @@
+import os
+from io import BytesIO
+
+from PIL import Image, ImageOps
+
+from . import constants as con
+
+
+def variant_name(source: str, variant: str, ext: str) -> str:
+    """Имя файла варианта изображения.
+
+    Args:
+        - source (str): Имя исходного изображения в хранилище.
+        - variant (str): Название варианта из `IMAGE_VARIANTS`.
+        - ext (str): Расширение файла.
+
+    Returns:
+        - str: Имя файла варианта в хранилище.
+    """
+    stem = os.path.splitext(os.path.basename(source))[0]
+    return f'{con.IMAGE_VARIANTS_DIR}{stem}/{variant}.{ext}'
+
+
+def flatten(image: Image.Image) -> Image.Image:
+    """Изображение без прозрачности на белом фоне.
+
+    Args:
+        - image (Image.Image): Изображение.
+
+    Returns:
+        - Image.Image: Изображение в `RGB`.
+    """
+    if image.mode == 'RGB':
+        return image
+    image = image.convert('RGBA')
+    background = Image.new('RGB', image.size, 'white')
+    background.paste(image, mask=image.getchannel('A'))
+    return background
+
+
+def make_variants(path: str) -> dict[str, dict[str, bytes]]:
+    """Уменьшенные копии изображения во всех форматах.
+    - Функция выполняется в отдельном процессе
+    и не использует Django.
+    - `JPEG` декодируется сразу в уменьшенном размере.
+
+    Args:
+        - path (str): Путь к исходному изображению.
+
+    Returns:
+        - dict[str, dict[str, bytes]]: Содержимое файлов
+        по вариантам и форматам.
+    """
+    largest = max(max(size) for size in con.IMAGE_VARIANTS.values())
+    with Image.open(path) as source:
+        source.draft('RGB', (largest, largest))
+        image = flatten(ImageOps.exif_transpose(source))
+    variants: dict[str, dict[str, bytes]] = {}
+    for variant, size in sorted(
+        con.IMAGE_VARIANTS.items(),
+        key=lambda item: item[1],
+        reverse=True,
+    ):
+        image = image.copy()
+        image.thumbnail(size, Image.LANCZOS)
+        variants[variant] = {}
+        for format, (pil_format, _) in con.IMAGE_FORMATS.items():
+            buffer = BytesIO()
+            image.save(buffer, pil_format, quality=con.IMAGE_QUALITY)
+            variants[variant][format] = buffer.getvalue()
+    return variants
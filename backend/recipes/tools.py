@@ -1,3 +1,10 @@
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.query import QuerySet
+
 from . import constants as con
 
 
@@ -15,3 +22,151 @@ def minutes_to_hours(minutes: int) -> str:
     if res > 0:
         return f' ({res} часов) '
     return ''
+
+
+def process_local_cache(alias: str = 'default') -> bool:
+    """Проверка кеша, не общего для процессов.
+    - Версии, измененные в одном процессе, не видны
+    другим процессам сервера и management командам.
+
+    Args:
+        - alias (str): Имя кеша в `CACHES`.
+
+    Returns:
+        - bool: Кеш в памяти процесса или без хранения.
+    """
+    return isinstance(caches[alias], (LocMemCache, DummyCache))
+
+
+def change_counter(queryset: QuerySet, field: str, delta: int) -> None:
+    """Изменение счетчика одним запросом без чтения объекта.
+
+    Args:
+        - queryset (QuerySet): Объекты со счетчиком.
+        - field (str): Поле счетчика.
+        - delta (int): Изменение счетчика.
+    """
+    queryset.update(**{field: Greatest(F(field) + delta, 0)})
+
+
+def count_subquery(model: any, field: str) -> Coalesce:
+    """Подзапрос количества связанных объектов.
+
+    Args:
+        - model (Model): Модель связанных объектов.
+        - field (str): Поле связи с внешней моделью.
+
+    Returns:
+        - Coalesce: Количество объектов или `0`.
+    """
+    return Coalesce(
+        Subquery(
+            model.objects.filter(**{field: OuterRef('pk')})
+            .order_by()
+            .values(field)
+            .annotate(count=Count('id'))
+            .values('count')
+        ),
+        0
+    )
+
+
+def fill_shopping_carts(
+    cart_model: any,
+    amount_model: any,
+    users: QuerySet or list[int] or None = None,
+    batch_size: int or None = None
+) -> int:
+    """Пересборка суммарных ингредиентов списков покупок.
+    - Суммы пересчитываются одним запросом с группировкой
+    и сохраняются пачками.
+
+    Args:
+        - cart_model (Model): Модель ингредиентов списков покупок.
+        - amount_model (Model): Модель ингредиентов рецептов.
+        - users (QuerySet or list[int] or None): Пользователи
+        или все пользователи.
+        - batch_size (int or None): Количество объектов в одном запросе.
+
+    Returns:
+        - int: Количество сохраненных ингредиентов.
+    """
+    carts = cart_model.objects.all()
+    totals = amount_model.objects.filter(recipe__shop_recipe__isnull=False)
+    if users is not None:
+        carts = carts.filter(user__in=users)
+        totals = amount_model.objects.filter(
+            recipe__shop_recipe__user__in=users
+        )
+    carts.delete()
+    created = cart_model.objects.bulk_create(
+        (
+            cart_model(user_id=user, ingredient_id=ingredient, amount=total)
+            for user, ingredient, total in totals.values(
+                'recipe__shop_recipe__user',
+                'ingredient',
+            ).annotate(
+                total=Sum('amount')
+            ).order_by().values_list(
+                'recipe__shop_recipe__user',
+                'ingredient',
+                'total',
+            )
+        ),
+        batch_size=batch_size,
+    )
+    return len(created)
+
+
+def fill_feeds(
+    feed_model: any,
+    recipe_model: any,
+    users: QuerySet or list[int] or None = None,
+    batch_size: int or None = None
+) -> int:
+    """Пересборка лент рецептов подписок.
+    - Рецепты авторов подписок выбираются одним запросом
+    и сохраняются пачками.
+    - Рецепты авторов с `feed_direct` в ленты не записываются.
+
+    Args:
+        - feed_model (Model): Модель лент рецептов.
+        - recipe_model (Model): Модель рецептов.
+        - users (QuerySet or list[int] or None): Пользователи
+        или все пользователи.
+        - batch_size (int or None): Количество объектов в одном запросе.
+
+    Returns:
+        - int: Количество сохраненных рецептов лент.
+    """
+    feeds = feed_model.objects.all()
+    recipes = recipe_model.objects.filter(
+        author__follow_following__isnull=False,
+        author__feed_direct=False,
+    )
+    if users is not None:
+        feeds = feeds.filter(user__in=users)
+        recipes = recipe_model.objects.filter(
+            author__follow_following__user__in=users,
+            author__feed_direct=False,
+        )
+    feeds.delete()
+    created = feed_model.objects.bulk_create(
+        (
+            feed_model(
+                user_id=user,
+                author_id=author,
+                recipe_id=recipe,
+                pub_data=pub_data,
+            )
+            for user, author, recipe, pub_data in recipes.order_by(
+            ).values_list(
+                'author__follow_following__user',
+                'author',
+                'id',
+                'pub_data',
+            ).iterator()
+        ),
+        batch_size=batch_size,
+    )
+    return len(created)
@@ -0,0 +1,77 @@
+from collections.abc import Iterable, Iterator
+from itertools import groupby
+from operator import itemgetter
+
+from . import constants as con
+
+
+def normalize_unit(unit: str) -> tuple[str, int] or None:
+    """Базовая единица и множитель для единицы измерения.
+
+    Args:
+        - unit (str): Единица измерения ингредиента.
+
+    Returns:
+        - tuple[str, int] or None: Базовая единица семейства (масса,
+        объем, штуки) и множитель или ничего для несовместимых единиц.
+    """
+    return con.UNITS.get(' '.join(unit.casefold().split()))
+
+
+def display_amount(base: str, amount: int) -> tuple[str, int or float]:
+    """Крупнейшая единица семейства для количества.
+
+    Args:
+        - base (str): Базовая единица семейства.
+        - amount (int): Количество в базовой единице.
+
+    Returns:
+        - tuple[str, int or float]: Единица измерения и количество.
+    """
+    for unit, factor in con.UNITS_DISPLAY[base]:
+        if amount >= factor:
+            break
+    if amount % factor:
+        return unit, round(amount / factor, 3)
+    return unit, amount // factor
+
+
+def merge_units(
+    rows: Iterable[tuple[str, str, int]]
+) -> Iterator[tuple[str, str, int or float]]:
+    """Объединение совместимых единиц измерения одного ингредиента.
+    - Строки обрабатываются за один проход, строки одного ингредиента
+    должны идти подряд.
+    - Если ингредиент указан в одной единице, строка не меняется.
+    - Совместимые единицы (`г` и `кг`, `мл` и `л`) переводятся
+    в базовую единицу, суммируются и выводятся в крупнейшей единице.
+    - Повторы неизвестной единицы суммируются без перевода.
+
+    Args:
+        - rows (Iterable[tuple[str, str, int]]): Название,
+        единица измерения и количество.
+
+    Returns:
+        - Iterator[tuple[str, str, int or float]]: Название,
+        единица измерения и количество.
+    """
+    for name, group in groupby(rows, key=itemgetter(0)):
+        group = list(group)
+        if len(group) == 1:
+            yield group[0]
+            continue
+        families: dict[str, list[tuple[str, int, int]]] = {}
+        for _, unit, amount in group:
+            base, factor = normalize_unit(unit) or (unit, 1)
+            families.setdefault(base, []).append(
+                (unit, amount, amount * factor)
+            )
+        for base, family in families.items():
+            if len(family) == 1:
+                yield (name, *family[0][:2])
+                continue
+            total = sum(amount for _, _, amount in family)
+            if base not in con.UNITS_DISPLAY:
+                yield name, base, total
+                continue
+            yield (name, *display_amount(base, total))
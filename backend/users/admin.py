@@ -15,6 +15,8 @@ class FoodgramUserAdmin(admin.ModelAdmin):
         'email',
         'first_name',
         'last_name',
+        'recipes_count',
+        'followers_count',
     )
     list_editable = (
         'first_name',
@@ -5,3 +5,6 @@ class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
     verbose_name = 'Пользователи проекта Foodgram'
+
+    def ready(self) -> None:
+        from . import checks, signals  # noqa: F401
@@ -0,0 +1,199 @@
+import copy
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import NamedTuple
+from uuid import uuid4
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from recipes.tools import process_local_cache
+from . import constants as con
+
+User = get_user_model()
+
+
+def auth_version_key(user_id: int) -> str:
+    """Ключ версии аутентификации пользователя.
+
+    Args:
+        - user_id (int): ID пользователя.
+
+    Returns:
+        - str: Ключ кеша.
+    """
+    return f'{con.AUTH_CACHE_VERSION_KEY}_{user_id}'
+
+
+def auth_version(user_id: int) -> str:
+    """Текущая версия аутентификации пользователя.
+    - Версия хранится в общем кеше и меняется при выходе
+    и изменении пользователя во всех процессах.
+
+    Args:
+        - user_id (int): ID пользователя.
+
+    Returns:
+        - str: Версия.
+    """
+    key = auth_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+class CachedToken(NamedTuple):
+    """Запись кеша токенов.
+
+    Attributes:
+        - token (Token): Токен с пользователем.
+        - version (str): Версия аутентификации пользователя.
+        - expires (float): Время устаревания записи.
+    """
+    token: Token
+    version: str
+    expires: float
+
+
+class TokenCache:
+    """Ограниченный LRU кеш токенов с временем жизни записей.
+    - Один кеш на процесс, записи вытесняются
+    при превышении `max_size` и устаревают через `ttl` секунд.
+    - Запись используется, пока версия аутентификации пользователя
+    в общем кеше не изменилась.
+    - Считает попадания, промахи, вытеснения и сбросы.
+    """
+    def __init__(self, max_size: int, ttl: int) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries: OrderedDict[str, CachedToken] = OrderedDict()
+        self.lock = Lock()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def get(self, key: str) -> Token or None:
+        """Токен из кеша.
+
+        Args:
+            - key (str): Ключ токена.
+
+        Returns:
+            - Token or None: Токен или ничего при промахе.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry.expires > time.monotonic():
+                self.entries.move_to_end(key)
+            else:
+                entry = None
+        if entry is not None and (
+            entry.version != cache.get(auth_version_key(entry.token.user_id))
+        ):
+            entry = None
+        with self.lock:
+            if entry is None:
+                self.entries.pop(key, None)
+                self.misses += 1
+                return None
+            self.hits += 1
+        return entry.token
+
+    def set(self, token: Token, version: str) -> None:
+        """Сохранение токена в кеш.
+        - Версия читается до запроса токена из базы данных,
+        иначе сброс между запросом и сохранением не заметен.
+
+        Args:
+            - token (Token): Токен с пользователем.
+            - version (str): Версия аутентификации пользователя,
+            прочитанная до запроса токена.
+        """
+        entry = CachedToken(token, version, time.monotonic() + self.ttl)
+        with self.lock:
+            self.entries[token.key] = entry
+            self.entries.move_to_end(token.key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id: int) -> None:
+        """Сброс токенов пользователя во всех процессах.
+
+        Args:
+            - user_id (int): ID пользователя.
+        """
+        cache.set(auth_version_key(user_id), uuid4().hex, None)
+        with self.lock:
+            for key in [
+                key for key, entry in self.entries.items()
+                if entry.token.user_id == user_id
+            ]:
+                del self.entries[key]
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        """Метрики кеша процесса.
+
+        Returns:
+            - dict: Размер, попадания, промахи, вытеснения,
+            сбросы и доля попаданий.
+        """
+        with self.lock:
+            requests = self.hits + self.misses
+            return {
+                'size': len(self.entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'hit_rate': round(self.hits / requests, 4) if requests else 0,
+            }
+
+
+token_cache = TokenCache(con.AUTH_CACHE_MAX_SIZE, con.AUTH_CACHE_TTL)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Аутентификация по токену с кешем `token_cache`.
+    - При попадании запросы к `authtoken_token` и пользователям
+    не выполняются.
+    - Каждый запрос получает копию пользователя и токена,
+    изменения объектов не попадают в кеш.
+    - С кешем, не общим для процессов, сброс токенов не доходит
+    до других процессов, поэтому токены читаются из базы данных.
+    - При промахе версия аутентификации читается после поиска
+    владельца токена и до чтения токена с пользователем.
+    """
+    def authenticate_credentials(self, key: str) -> tuple[User, Token]:
+        if process_local_cache():
+            return super().authenticate_credentials(key)
+        token = token_cache.get(key)
+        if token is None:
+            user_id = Token.objects.filter(key=key).values_list(
+                'user_id',
+                flat=True,
+            ).first()
+            if user_id is None:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            version = auth_version(user_id)
+            try:
+                token = Token.objects.select_related('user').get(key=key)
+            except Token.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            token_cache.set(token, version)
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(
+                _('User inactive or deleted.')
+            )
+        user = copy.copy(token.user)
+        token = copy.copy(token)
+        token.user = user
+        return user, token
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+from recipes.tools import process_local_cache
+from . import constants as con
+
+
+@register(Tags.security, Tags.caches)
+def check_token_cache(app_configs: any, **kwargs) -> list[Warning]:
+    """Проверка кеша версий аутентификации.
+    - С кешем, не общим для процессов, `CachedTokenAuthentication`
+    читает токены из базы данных.
+
+    Returns:
+        - list[Warning]: Предупреждение, если кеш токенов отключен.
+    """
+    classes = getattr(settings, 'REST_FRAMEWORK', {}).get(
+        'DEFAULT_AUTHENTICATION_CLASSES',
+        (),
+    )
+    if con.AUTH_CACHED_CLASS not in classes or not process_local_cache():
+        return []
+    return [
+        Warning(
+            con.CHECK_TOKEN_CACHE,
+            hint=con.CHECK_TOKEN_CACHE_HINT,
+            id='users.W001',
+        )
+    ]
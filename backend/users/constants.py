@@ -8,11 +8,19 @@ MODEL_NAME_LAST_NAME: str = 'Фамилия'
 MODEL_NAME_PASSWORD: str = 'Пароль'
 MODEL_NAME_USER: str = 'Пользователь'
 MODEL_NAME_FOLLOWING: str = 'Подписан на пользователя'
+MODEL_NAME_RECIPES_COUNT: str = 'Количество рецептов'
+MODEL_NAME_FOLLOWERS_COUNT: str = 'Количество подписчиков'
+MODEL_NAME_FEED_DIRECT: str = 'Рецепты читаются напрямую'
 MODEL_HELP_REQUIRED: str = 'Обязательно для заполнения, '
 MODEL_HELP_MAX_EMAIL: str = 'не более 254 символов.'
 MODEL_HELP_MAX_FIELD: str = 'не более 150 символов.'
 MODEL_HELP_USER: str = 'Пользователь который подписан.'
 MODEL_HELP_FOLLOWING: str = 'Пользователь на которого подписаны.'
+MODEL_HELP_COUNTER: str = 'Обновляется автоматически.'
+MODEL_HELP_FEED_DIRECT: str = (
+    'Рецепты автора не записываются в ленты подписчиков. '
+    'Обновляется автоматически.'
+)
 MODEL_ERROR_VALIDATE_USERNAME: str = 'Имя аккаунта указан не корректно.'
 
 """Константы админ-зоны."""
@@ -31,3 +39,19 @@ SERIALIZER_ERROR_VALIDATE_UNIQUE_USERNAME: tuple[str] = (
 VIEW_ERROR_FOLLOW_YOURSELF: str = 'Нельзя подписаться на себя.'
 VIEW_ERROR_FOLLOW_ALREADY: str = 'Вы уже подписаны на пользователя.'
 VIEW_ERROR_FOLLOW_WERE_NOT: str = 'Вы не были подписаны на пользователя.'
+
+"""Константы аутентификации."""
+AUTH_CACHE_MAX_SIZE: int = 10000
+AUTH_CACHE_TTL: int = 60 * 5
+AUTH_CACHE_VERSION_KEY: str = 'auth_version'
+AUTH_CACHED_CLASS: str = 'users.authentication.CachedTokenAuthentication'
+
+"""Константы проверок."""
+CHECK_TOKEN_CACHE: str = (
+    'Кеш `default` не общий для процессов: выход и смена пароля '
+    'не сбрасывают токены в других процессах, '
+    'кеш токенов отключен.'
+)
+CHECK_TOKEN_CACHE_HINT: str = (
+    'Укажите общий кеш в `FOODGRAM_CACHE_BACKEND`.'
+)
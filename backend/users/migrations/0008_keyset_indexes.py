@@ -0,0 +1,25 @@
+# Generated by Django 3.2.16 on 2026-10-18 18:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_user_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='follow',
+            index=models.Index(fields=['user', 'id'], name='follow_user_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='follow',
+            index=models.Index(fields=['following', 'id'], name='follow_following_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='foodgramuser',
+            index=models.Index(fields=['username', 'id'], name='user_username_id_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 3.2.16 on 2026-10-18 20:05
+
+from django.db import migrations, models
+
+FEED_FANOUT_MAX_FOLLOWERS = 1000
+
+
+def fill_feed_direct(apps, schema_editor):
+    User = apps.get_model('users', 'FoodgramUser')
+    User.objects.filter(
+        followers_count__gt=FEED_FANOUT_MAX_FOLLOWERS
+    ).update(feed_direct=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='foodgramuser',
+            name='feed_direct',
+            field=models.BooleanField(default=False, editable=False, help_text='Рецепты автора не записываются в ленты подписчиков. Обновляется автоматически.', verbose_name='Рецепты читаются напрямую'),
+        ),
+        migrations.RunPython(
+            fill_feed_direct,
+            migrations.RunPython.noop,
+        ),
+    ]
@@ -56,6 +56,24 @@ class FoodgramUser(AbstractUser):
             f'{con.MODEL_HELP_MAX_FIELD}'
         ),
     )
+    recipes_count = models.PositiveIntegerField(
+        con.MODEL_NAME_RECIPES_COUNT,
+        default=0,
+        editable=False,
+        help_text=con.MODEL_HELP_COUNTER,
+    )
+    followers_count = models.PositiveIntegerField(
+        con.MODEL_NAME_FOLLOWERS_COUNT,
+        default=0,
+        editable=False,
+        help_text=con.MODEL_HELP_COUNTER,
+    )
+    feed_direct = models.BooleanField(
+        con.MODEL_NAME_FEED_DIRECT,
+        default=False,
+        editable=False,
+        help_text=con.MODEL_HELP_FEED_DIRECT,
+    )
 
     USERNAME_FIELD: str = 'email'
     REQUIRED_FIELDS: list[str] = [
@@ -74,6 +92,12 @@ class FoodgramUser(AbstractUser):
             'email',
             'date_joined',
         )
+        indexes = [
+            models.Index(
+                fields=['username', 'id'],
+                name='user_username_id_idx',
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.username
@@ -105,6 +129,16 @@ class Follow(models.Model):
                 name='unique_follow'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['user', 'id'],
+                name='follow_user_id_idx',
+            ),
+            models.Index(
+                fields=['following', 'id'],
+                name='follow_following_id_idx',
+            ),
+        ]
         ordering = (
             'user',
             'id',
@@ -5,10 +5,9 @@ from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
 
 from api.v1.tools import ShortRecipeSerialize
-from recipes.models import Recipe
 from . import constants as con
 from .models import Follow
-from .tools import get_follow
+from .tools import attach_recipes_preview, get_subscriptions
 
 User = get_user_model()
 Get_user = User.objects.all()
@@ -51,11 +50,38 @@ class FoodgramUserCreateSerializer(UserCreateSerializer):
         )
 
 
+class UserListSerializer(serializers.ListSerializer):
+    """Список пользователей с загрузкой подписок одним запросом."""
+    def to_representation(self, data: any) -> list:
+        data = list(data.all() if hasattr(data, 'all') else data)
+        get_subscriptions(self.context).load(
+            user.id for user in data if not hasattr(user, 'is_subscribed')
+        )
+        return super().to_representation(data)
+
+
+class FollowListSerializer(serializers.ListSerializer):
+    """Список подписок текущего пользователя.
+    - Авторы подписок текущего пользователя отмечаются
+    подписанными без запроса, остальные загружаются одним запросом.
+    """
+    def to_representation(self, data: any) -> list:
+        data = list(data.all() if hasattr(data, 'all') else data)
+        subscriptions = get_subscriptions(self.context)
+        subscriptions.add(
+            follow.following_id for follow in data
+            if follow.user_id == subscriptions.user.id
+        )
+        subscriptions.load(follow.following_id for follow in data)
+        return super().to_representation(data)
+
+
 class FoodgramUserSerializer(UserSerializer):
     """Сериализатор пользователей для `Djoser`."""
     is_subscribed = serializers.SerializerMethodField()
 
     class Meta:
+        list_serializer_class = UserListSerializer
         model = User
         fields = (
             'email',
@@ -75,7 +101,9 @@ class FoodgramUserSerializer(UserSerializer):
         Returns:
             - bool: Подписан пользователь или нет.
         """
-        return get_follow(self.context['request'].user, obj.id)
+        if hasattr(obj, 'is_subscribed'):
+            return obj.is_subscribed
+        return get_subscriptions(self.context).is_subscribed(obj.id)
 
 
 class FollowSerializer(serializers.ModelSerializer):
@@ -105,6 +133,7 @@ class FollowSerializer(serializers.ModelSerializer):
     recipes_count = serializers.SerializerMethodField()
 
     class Meta:
+        list_serializer_class = FollowListSerializer
         model = Follow
         fields = (
             'email',
@@ -126,10 +155,14 @@ class FollowSerializer(serializers.ModelSerializer):
         Returns:
             - bool: Подписан пользователь или нет.
         """
-        return get_follow(self.context['request'].user, obj.following)
+        return get_subscriptions(self.context).is_subscribed(
+            obj.following_id
+        )
 
     def get_recipes(self, obj: Follow) -> ShortRecipeSerialize:
         """Получение ограниченного количества рецептов автора.
+        - Рецепты берутся из `preview_recipes`,
+        для отдельной подписки загружаются одним запросом.
 
         Args:
             obj (Follow): Модель подписок.
@@ -137,13 +170,9 @@ class FollowSerializer(serializers.ModelSerializer):
         Returns:
             ShortRecipeSerialize: Ограниченного количества рецептов автора.
         """
-        limit = self.context.get(
-            'request'
-        ).query_params.get('recipes_limit')
-        recipe = Recipe.objects.filter(author=obj.following)
-        if limit:
-            recipe = recipe[:int(limit)]
-        return ShortRecipeSerialize(recipe, many=True).data
+        if not hasattr(obj, 'preview_recipes'):
+            attach_recipes_preview([obj], self.context.get('recipes_limit'))
+        return ShortRecipeSerialize(obj.preview_recipes, many=True).data
 
     def get_recipes_count(self, obj: Follow) -> int:
         """Количество рецептов.
@@ -155,4 +184,9 @@ class FollowSerializer(serializers.ModelSerializer):
         Returns:
             int: Количество рецептов у автора.
         """
-        return obj.following.recipe_author.count()
+        return obj.following.recipes_count
+
+
+class RecipesLimitSerializer(serializers.Serializer):
+    """Параметр `recipes_limit` запросов подписок."""
+    recipes_limit = serializers.IntegerField(min_value=0, required=False)
@@ -0,0 +1,74 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from recipes.feed import (backfill_feed, switch_to_direct_read,
+                          switch_to_fan_out, trim_feed,)
+from recipes.tools import change_counter
+from .authentication import token_cache
+from .models import Follow
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Follow)
+def follow_created(
+    sender: type[Follow],
+    instance: Follow,
+    created: bool,
+    raw: bool = False,
+    **kwargs
+) -> None:
+    """Увеличение счетчика подписчиков у автора
+    и запись рецептов автора в ленту подписчика.
+    - Когда подписчиков автора больше `FEED_FANOUT_MAX_FOLLOWERS`,
+    его рецепты перестают записываться в ленты.
+    """
+    if created and not raw:
+        change_counter(
+            User.objects.filter(id=instance.following_id),
+            'followers_count',
+            1
+        )
+        switch_to_direct_read(instance.following_id)
+        backfill_feed(instance.user_id, instance.following_id)
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(
+    sender: type[Follow],
+    instance: Follow,
+    **kwargs
+) -> None:
+    """Уменьшение счетчика подписчиков у автора
+    и удаление рецептов автора из ленты подписчика.
+    - Когда подписчиков автора не больше
+    `FEED_FANOUT_MIN_FOLLOWERS`, рецепты автора
+    снова записываются в ленты оставшихся подписчиков.
+    """
+    change_counter(
+        User.objects.filter(id=instance.following_id),
+        'followers_count',
+        -1
+    )
+    trim_feed(instance.user_id, instance.following_id)
+    switch_to_fan_out(instance.following_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Token)
+def authentication_changed(
+    sender: type[User] or type[Token],
+    instance: User or Token,
+    **kwargs
+) -> None:
+    """Сброс кеша токенов пользователя после фиксации транзакции
+    при изменении пользователя или удалении токена.
+    """
+    user_id = instance.id if sender is User else instance.user_id
+    transaction.on_commit(partial(token_cache.invalidate, user_id))
@@ -1,23 +1,158 @@
+from collections import defaultdict
+from typing import Iterable
+
 from django.contrib.auth import get_user_model
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
 
+from recipes.models import Recipe
 from .models import Follow
 
 User = get_user_model()
 
 
-def get_follow(user: User, id: int) -> bool:
-    """Проверка подписки на пользователя.
+class SubscriptionResolver:
+    """Проверка подписок текущего пользователя.
+    - Подписки на авторов страницы загружаются одним запросом,
+    дальше ответ берется из множества ID.
+    - Подписки аноним не загружаются.
+    """
+    def __init__(self, user: User) -> None:
+        self.user = user
+        self.followed: set[int] = set()
+        self.loaded: set[int] = set()
+
+    def add(self, ids: Iterable[int]) -> None:
+        """Добавление известных подписок без запроса.
+
+        Args:
+            - ids (Iterable[int]): ID авторов, на которых подписан
+            текущий пользователь.
+        """
+        ids = set(ids)
+        self.followed |= ids
+        self.loaded |= ids
+
+    def load(self, ids: Iterable[int]) -> None:
+        """Загрузка подписок на авторов одним запросом.
+
+        Args:
+            - ids (Iterable[int]): ID авторов.
+        """
+        ids = set(ids) - self.loaded
+        if not ids:
+            return
+        if not self.user.is_anonymous:
+            self.followed.update(
+                Follow.objects.filter(
+                    user=self.user,
+                    following_id__in=ids,
+                ).values_list('following_id', flat=True)
+            )
+        self.loaded |= ids
+
+    def is_subscribed(self, id: int) -> bool:
+        """Подписан ли текущий пользователь на автора.
+
+        Args:
+            - id (int): ID автора.
+
+        Returns:
+            - bool: Подписан пользователь или нет.
+        """
+        if self.user.is_anonymous:
+            return False
+        self.load((id,))
+        return id in self.followed
+
+
+def get_subscriptions(context: dict) -> SubscriptionResolver:
+    """Проверка подписок из контекста сериализатора.
+    - Одна проверка на запрос, создается при первом обращении.
+
+    Args:
+        - context (dict): Контекст сериализатора с запросом.
+
+    Returns:
+        - SubscriptionResolver: Проверка подписок текущего пользователя.
+    """
+    request = context['request']
+    if not hasattr(request, 'subscriptions'):
+        request.subscriptions = SubscriptionResolver(request.user)
+    return request.subscriptions
+
+
+def recipes_preview(
+    author_ids: Iterable[int],
+    limit: int or None = None
+) -> dict[int, list[Recipe]]:
+    """Последние рецепты авторов одним запросом.
+    - С ограничением рецепты нумеруются внутри автора
+    `ROW_NUMBER() OVER (PARTITION BY author_id ...)`
+    и отбираются первые `limit` рецептов каждого автора.
+    - Порядок рецептов совпадает с порядком модели `Recipe`.
+
+    Args:
+        - author_ids (Iterable[int]): ID авторов.
+        - limit (int or None): Количество рецептов автора.
+
+    Returns:
+        - dict[int, list[Recipe]]: Рецепты по ID автора.
+    """
+    author_ids = set(author_ids)
+    if not author_ids:
+        return {}
+    recipes = Recipe.objects.filter(
+        author_id__in=author_ids,
+    ).only(
+        'id',
+        'author_id',
+        'name',
+        'image',
+        'image_variants',
+        'cooking_time',
+    )
+    if limit is not None:
+        sql, params = recipes.annotate(
+            row_number=Window(
+                RowNumber(),
+                partition_by=F('author_id'),
+                order_by=[
+                    F('pub_data').desc(),
+                    F('name').asc(),
+                    F('id').asc(),
+                ],
+            ),
+        ).order_by().query.sql_with_params()
+        recipes = Recipe.objects.raw(
+            f'SELECT * FROM ({sql}) AS ranked '
+            'WHERE ranked.row_number <= %s '
+            'ORDER BY ranked.author_id, ranked.row_number',
+            (*params, limit),
+        )
+    preview: dict[int, list[Recipe]] = defaultdict(list)
+    for recipe in recipes:
+        preview[recipe.author_id].append(recipe)
+    return preview
+
+
+def attach_recipes_preview(
+    follows: list[Follow],
+    limit: int or None = None
+) -> list[Follow]:
+    """Добавление последних рецептов авторов к подпискам.
 
     Args:
-        user (User): Пользователь.
-        id (int): ID пользователя для подписки.
+        - follows (list[Follow]): Подписки страницы.
+        - limit (int or None): Количество рецептов автора.
 
     Returns:
-        bool: Подписан пользователь или нет.
+        - list[Follow]: Подписки с рецептами в `preview_recipes`.
     """
-    if user.is_anonymous:
-        return False
-    return Follow.objects.filter(
-        user=user,
-        following=id
-    ).exists()
+    preview = recipes_preview(
+        (follow.following_id for follow in follows),
+        limit,
+    )
+    for follow in follows:
+        follow.preview_recipes = preview.get(follow.following_id, [])
+    return follows
@@ -1,17 +1,24 @@
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from djoser.views import UserViewSet
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.pagination import LimitOffsetPagination
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
-from api.v1.paginations import RecipeAndSubscriptionPagination
+from api.v1.paginations import (FollowCursorPagination,
+                                RecipeAndSubscriptionPagination,
+                                UserCursorPagination,)
+from recipes.tools import process_local_cache
 from users.models import Follow
 from . import constants as con
-from .serializers import FollowSerializer
+from .authentication import token_cache
+from .serializers import FollowSerializer, RecipesLimitSerializer
+from .tools import attach_recipes_preview
 
 User = get_user_model()
 
@@ -21,13 +28,70 @@ class FoodgramUserViewSet(UserViewSet):
     - Запросы `me/` доступны авторизованному пользователю.
     - Запросы `subscriptions/` доступны авторизованному пользователю.
     - Запросы `subscribe/` доступны авторизованному пользователю.
+    - Запросы `followers/` доступны авторизованному пользователю.
     - Запросы к остальным путям доступны любому пользователю.
+    - Параметр `cursor` включает курсорную пагинацию
+    списка пользователей, подписок и подписчиков.
     Raise:
         - Не работает просмотр пользователя для анонима ошибка в `frontend`.
     """
     pagination_class = LimitOffsetPagination
     permission_classes = [AllowAny]
 
+    @property
+    def paginator(self) -> LimitOffsetPagination or UserCursorPagination:
+        """Пагинация пользователей.
+        - Курсорная если в запросе передан параметр `cursor`.
+
+        Returns:
+            - LimitOffsetPagination or UserCursorPagination: Пагинация.
+        """
+        if not hasattr(self, '_paginator'):
+            request = getattr(self, 'request', None)
+            if (
+                request is not None
+                and UserCursorPagination.cursor_query_param
+                in request.query_params
+            ):
+                self._paginator = UserCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    def get_follow_paginator(
+        self,
+        request: Request
+    ) -> RecipeAndSubscriptionPagination or FollowCursorPagination:
+        """Пагинация подписок и подписчиков.
+        - Курсорная если в запросе передан параметр `cursor`.
+
+        Args:
+            - request (Request): Запрос.
+
+        Returns:
+            - RecipeAndSubscriptionPagination or FollowCursorPagination:
+            Пагинация.
+        """
+        if FollowCursorPagination.cursor_query_param in request.query_params:
+            return FollowCursorPagination()
+        return RecipeAndSubscriptionPagination()
+
+    def get_recipes_limit(self, request: Request) -> int or None:
+        """Проверенный параметр `recipes_limit`.
+
+        Args:
+            - request (Request): Запрос.
+
+        Raises:
+            - ValidationError: Параметр не является целым числом.
+
+        Returns:
+            - int or None: Количество рецептов автора или ничего.
+        """
+        serializer = RecipesLimitSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data.get('recipes_limit')
+
     @action(
         methods=['get'],
         permission_classes=[IsAuthenticated],
@@ -52,6 +116,8 @@ class FoodgramUserViewSet(UserViewSet):
     )
     def subscriptions(self, request: Request) -> Response:
         """Обработка запросов к `api/users/subscriptions`.
+        - Последние рецепты всех авторов страницы
+        загружаются одним запросом.
 
         Args:
             - request (Request): Запрос.
@@ -59,13 +125,47 @@ class FoodgramUserViewSet(UserViewSet):
         Returns:
             - Response: Пользователи на которых подписан текущий пользователь.
         """
-        author = Follow.objects.filter(user=request.user)
-        paginator = RecipeAndSubscriptionPagination()
-        result = paginator.paginate_queryset(author, request)
+        recipes_limit = self.get_recipes_limit(request)
+        author = Follow.objects.filter(
+            user=request.user,
+        ).select_related('following').order_by('id')
+        paginator = self.get_follow_paginator(request)
+        result = attach_recipes_preview(
+            paginator.paginate_queryset(author, request),
+            recipes_limit,
+        )
         serializer = FollowSerializer(
             result,
             many=True,
-            context={'request': request},
+            context={'request': request, 'recipes_limit': recipes_limit},
+        )
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(
+        methods=['get'],
+        permission_classes=[IsAuthenticated],
+        detail=False,
+    )
+    def followers(self, request: Request) -> Response:
+        """Обработка запросов к `api/users/followers`.
+        - Подписчики текущего пользователя в порядке подписки.
+
+        Args:
+            - request (Request): Запрос.
+
+        Returns:
+            - Response: Пользователи подписанные на текущего пользователя.
+        """
+        follows = Follow.objects.filter(
+            following=request.user,
+        ).select_related('user').order_by('id')
+        paginator = self.get_follow_paginator(request)
+        serializer = self.get_serializer(
+            [
+                follow.user
+                for follow in paginator.paginate_queryset(follows, request)
+            ],
+            many=True,
         )
         return paginator.get_paginated_response(serializer.data)
 
@@ -74,6 +174,7 @@ class FoodgramUserViewSet(UserViewSet):
         permission_classes=[IsAuthenticated],
         detail=True,
     )
+    @transaction.atomic
     def subscribe(self, request: Request, id: int = None) -> Response:
         """Обработка запросов к `api/users/subscriptions`.
 
@@ -87,6 +188,7 @@ class FoodgramUserViewSet(UserViewSet):
         author = get_object_or_404(User, id=id)
         follow = Follow.objects.filter(user=request.user, following=author)
         if request.method == 'POST':
+            recipes_limit = self.get_recipes_limit(request)
             if request.user == author:
                 return Response(
                     {'errors': con.VIEW_ERROR_FOLLOW_YOURSELF},
@@ -98,7 +200,13 @@ class FoodgramUserViewSet(UserViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             follow = Follow.objects.create(user=request.user, following=author)
-            serializer = FollowSerializer(follow, context={'request': request})
+            serializer = FollowSerializer(
+                follow,
+                context={
+                    'request': request,
+                    'recipes_limit': recipes_limit,
+                },
+            )
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         if follow.exists():
             follow.delete()
@@ -109,3 +217,26 @@ class FoodgramUserViewSet(UserViewSet):
             {'error': con.VIEW_ERROR_FOLLOW_WERE_NOT},
             status=status.HTTP_400_BAD_REQUEST
         )
+
+
+class TokenCacheStatsView(APIView):
+    """Обработка запросов к `api/auth/token/stats/`.
+    - Метрики кеша токенов процесса, обработавшего запрос.
+    - Доступно только администратору.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request: Request) -> Response:
+        """Метрики кеша токенов.
+
+        Args:
+            - request (Request): Запрос.
+
+        Returns:
+            - Response: Размер, попадания, промахи, вытеснения,
+            сбросы, доля попаданий и включен ли кеш.
+        """
+        return Response({
+            **token_cache.stats(),
+            'enabled': not process_local_cache(),
+        })